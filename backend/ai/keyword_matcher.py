@@ -0,0 +1,75 @@
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    import ahocorasick  # Optional dependency (pyahocorasick)
+except Exception:
+    ahocorasick = None  # Fallback to plain substring scans
+
+
+class KeywordMatcher:
+    """Find which keywords of a fixed list occur in a text in a single pass"""
+
+    def __init__(self, keywords: Iterable[str]):
+        # Keep the original order so results read like the keyword list
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(keywords))
+
+        self._automaton = None
+        if ahocorasick is not None and self.keywords:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def find(self, text: str) -> List[str]:
+        """Return the keywords contained in text, in keyword-list order"""
+        if not text:
+            return []
+
+        if self._automaton is None:
+            return [keyword for keyword in self.keywords if keyword in text]
+
+        found = {keyword for _, keyword in self._automaton.iter(text)}
+        return [keyword for keyword in self.keywords if keyword in found]
+
+    def count(self, text: str, limit: Optional[int] = None) -> int:
+        """Return how many distinct keywords occur in text
+
+        With a limit the scan stops as soon as that many distinct keywords
+        were seen, for callers that only compare the count to thresholds.
+        """
+        if limit is None:
+            return len(self.find(text))
+        if not text:
+            return 0
+
+        if self._automaton is None:
+            hits = (keyword for keyword in self.keywords if keyword in text)
+        else:
+            hits = (keyword for _, keyword in self._automaton.iter(text))
+
+        seen = set()
+        for keyword in hits:
+            seen.add(keyword)
+            if len(seen) >= limit:
+                break
+        return len(seen)
+
+    def contains_any(self, text: str) -> bool:
+        """Return True if at least one keyword occurs in text"""
+        if not text:
+            return False
+
+        if self._automaton is None:
+            return any(keyword in text for keyword in self.keywords)
+
+        for _ in self._automaton.iter(text):
+            return True
+        return False
+
+
+@lru_cache(maxsize=None)
+def get_keyword_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """Return a matcher for keywords, shared across all callers"""
+    return KeywordMatcher(keywords)
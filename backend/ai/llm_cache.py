@@ -0,0 +1,100 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+try:
+    import redis  # Optional dependency for sharing the cache across processes
+except Exception:
+    redis = None  # Fallback to the in-process cache only
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "llm_cache:"
+
+
+def make_cache_key(
+    model: str, system_prompt: str, user_prompt: str, temperature: float
+) -> str:
+    """Return a stable key identifying one chat completion request"""
+    payload = json.dumps(
+        {
+            "model": model,
+            "system": system_prompt,
+            "user": user_prompt,
+            "temperature": temperature,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """LRU cache of LLM completions with expiry, optionally backed by Redis"""
+
+    def __init__(self, maxsize: int = 1024, ttl: int = 3600, redis_url: str = ""):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._redis = None
+        if redis_url and redis is not None:
+            try:
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+            except Exception as e:
+                logger.warning(f"Redis LLM cache disabled: {str(e)}")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion for key, or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+
+        if self._redis is None:
+            return None
+
+        try:
+            value = self._redis.get(REDIS_KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"Error reading LLM cache from Redis: {str(e)}")
+            return None
+
+        if value is None:
+            return None
+
+        value = value.decode("utf-8")
+        self._store_local(key, value, now)
+        return value
+
+    def set(self, key: str, value: str):
+        """Cache a completion for key"""
+        self._store_local(key, value, time.time())
+
+        if self._redis is not None:
+            try:
+                self._redis.setex(REDIS_KEY_PREFIX + key, self.ttl, value)
+            except Exception as e:
+                logger.warning(f"Error writing LLM cache to Redis: {str(e)}")
+
+    def clear(self):
+        """Drop every entry of the in-process cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def _store_local(self, key: str, value: str, now: float):
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
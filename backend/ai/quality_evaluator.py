@@ -1,14 +1,47 @@
 import re
-import jieba
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Mapping, Sequence
 from dataclasses import dataclass
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 from ..models import TestCase, TestCaseEvaluation, KnowledgeBase
+from .keyword_matcher import get_keyword_matcher
+from . import segmentation
 import logging
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Rows fetched per round trip when streaming test cases in batch_evaluate
+BATCH_EVALUATE_CHUNK_SIZE = 200
+
+# Precompiled patterns shared by all evaluator instances
+_STEPS_RE = re.compile(r'\d+\.\s+')
+
+# Scoring ladders: (minimum count, points) pairs, highest threshold first
+_STEPS_POINTS = ((3, 40), (2, 30), (1, 20))
+_TECHNICAL_TERM_POINTS = ((3, 40), (2, 30), (1, 20))
+_OPERATION_POINTS = ((3, 30), (2, 20), (1, 10))
+_MEASUREMENT_POINTS = ((2, 30), (1, 20))
+_ACTIONABLE_POINTS = ((3, 60), (2, 45), (1, 30))
+_VERIFIABLE_POINTS = ((2, 40), (1, 25))
+_ASPECT_POINTS = ((3, 50), (2, 35), (1, 20))
+_CLEAR_ACTION_POINTS = ((2, 60), (1, 40))
+
+
+# Common typos and their corrections
+_COMMON_TYPOS = {
+    "坐椅": "座椅",
+    "点机": "点击"
+}
+
+
+def _ladder_points(count: int, ladder) -> int:
+    """Return the points of the first threshold reached by count"""
+    for minimum, points in ladder:
+        if count >= minimum:
+            return points
+    return 0
+
+@dataclass(frozen=True)
 class EvaluationResult:
     completeness_score: float
     accuracy_score: float
@@ -16,96 +49,98 @@ class EvaluationResult:
     coverage_score: float
     clarity_score: float
     total_score: float
-    evaluation_details: Dict[str, Any]
-    suggestions: List[str]
+    evaluation_details: Mapping[str, Any]
+    suggestions: Sequence[str]
+
+
+# Result returned when an evaluation fails; shared, so its fields are read-only
+_DEFAULT_EVALUATION = EvaluationResult(
+    completeness_score=0,
+    accuracy_score=0,
+    executability_score=0,
+    coverage_score=0,
+    clarity_score=0,
+    total_score=0,
+    evaluation_details=MappingProxyType({}),
+    suggestions=("评估过程中出现错误，请重新评估",)
+)
 
 
 class QualityEvaluator:
-    def __init__(self):
-        # Weight for each evaluation dimension
-        self.weights = {
-            "completeness": 0.25,
-            "accuracy": 0.25,
-            "executability": 0.20,
-            "coverage": 0.20,
-            "clarity": 0.10
-        }
-        
-        # Keywords for different evaluation criteria
-        self.completeness_keywords = {
-            "preconditions": ["前置条件", "预条件", "准备", "初始", "环境"],
-            "steps": ["步骤", "操作", "执行", "点击", "输入"],
-            "expected": ["预期", "期望", "结果", "输出", "显示"]
-        }
-        
-        self.accuracy_keywords = {
-            "technical_terms": ["座椅", "调节", "记忆", "加热", "通风", "按摩", "安全"],
-            "operations": ["点击", "设置", "调整", "启动", "停止", "切换"],
-            "measurements": ["角度", "温度", "时间", "速度", "位置"]
-        }
-        
-        self.executability_keywords = {
-            "actionable": ["点击", "设置", "调整", "输入", "选择", "确认"],
-            "verifiable": ["检查", "验证", "观察", "确认", "测量", "显示"]
-        }
-        
-        self.coverage_keywords = {
-            "function_types": ["功能", "边界", "异常", "性能", "安全"],
-            "test_aspects": ["正常", "异常", "边界", "性能", "安全", "兼容"]
-        }
-        
-        self.clarity_keywords = {
-            "clear_actions": ["具体", "明确", "详细", "清晰"],
-            "ambiguous": ["可能", "大概", "也许", "似乎", "模糊"]
-        }
+    # Keyword tables and the matchers derived from them are built once per
+    # process and shared by every instance
+    
+    # Weight for each evaluation dimension
+    weights = {
+        "completeness": 0.25,
+        "accuracy": 0.25,
+        "executability": 0.20,
+        "coverage": 0.20,
+        "clarity": 0.10
+    }
+    
+    # Keywords for different evaluation criteria
+    completeness_keywords = {
+        "preconditions": ["前置条件", "预条件", "准备", "初始", "环境"],
+        "steps": ["步骤", "操作", "执行", "点击", "输入"],
+        "expected": ["预期", "期望", "结果", "输出", "显示"]
+    }
+    
+    accuracy_keywords = {
+        "technical_terms": ["座椅", "调节", "记忆", "加热", "通风", "按摩", "安全"],
+        "operations": ["点击", "设置", "调整", "启动", "停止", "切换"],
+        "measurements": ["角度", "温度", "时间", "速度", "位置"]
+    }
+    
+    executability_keywords = {
+        "actionable": ["点击", "设置", "调整", "输入", "选择", "确认"],
+        "verifiable": ["检查", "验证", "观察", "确认", "测量", "显示"]
+    }
+    
+    coverage_keywords = {
+        "function_types": ["功能", "边界", "异常", "性能", "安全"],
+        "test_aspects": ["正常", "异常", "边界", "性能", "安全", "兼容"]
+    }
+    
+    clarity_keywords = {
+        "clear_actions": ["具体", "明确", "详细", "清晰"],
+        "ambiguous": ["可能", "大概", "也许", "似乎", "模糊"]
+    }
+    
+    @classmethod
+    def _prepare_keywords(cls):
+        """Build the matchers and frozen keyword sets shared by all instances"""
+        # Keep every accuracy keyword a single token in the segmentation output
+        for keywords in cls.accuracy_keywords.values():
+            segmentation.register_words(keywords)
+        
+        # Multi-keyword matchers for the substring scans (built from the ordered lists)
+        cls._actionable_matcher = get_keyword_matcher(tuple(cls.executability_keywords["actionable"]))
+        cls._verifiable_matcher = get_keyword_matcher(tuple(cls.executability_keywords["verifiable"]))
+        cls._aspects_matcher = get_keyword_matcher(tuple(cls.coverage_keywords["test_aspects"]))
+        cls._clear_actions_matcher = get_keyword_matcher(tuple(cls.clarity_keywords["clear_actions"]))
+        cls._ambiguous_matcher = get_keyword_matcher(tuple(cls.clarity_keywords["ambiguous"]))
+        cls._typo_matcher = get_keyword_matcher(tuple(_COMMON_TYPOS))
+        
+        # Freeze the keyword lists for O(1) membership checks
+        for keyword_groups in (
+            cls.completeness_keywords,
+            cls.accuracy_keywords,
+            cls.executability_keywords,
+            cls.coverage_keywords,
+            cls.clarity_keywords
+        ):
+            for key, keywords in keyword_groups.items():
+                keyword_groups[key] = frozenset(keywords)
+        
+        cls._acc_tech = cls.accuracy_keywords["technical_terms"]
+        cls._acc_ops = cls.accuracy_keywords["operations"]
+        cls._acc_meas = cls.accuracy_keywords["measurements"]
     
     def evaluate_test_case(self, test_case: TestCase, db: Session) -> EvaluationResult:
         """Evaluate a test case and return detailed scores"""
         try:
-            # Evaluate each dimension
-            completeness = self._evaluate_completeness(test_case)
-            accuracy = self._evaluate_accuracy(test_case, db)
-            executability = self._evaluate_executability(test_case)
-            coverage = self._evaluate_coverage(test_case, db)
-            clarity = self._evaluate_clarity(test_case)
-            
-            # Calculate total score
-            total_score = (
-                completeness * self.weights["completeness"] +
-                accuracy * self.weights["accuracy"] +
-                executability * self.weights["executability"] +
-                coverage * self.weights["coverage"] +
-                clarity * self.weights["clarity"]
-            )
-            
-            # Generate evaluation details
-            evaluation_details = {
-                "completeness_details": self._get_completeness_details(test_case),
-                "accuracy_details": self._get_accuracy_details(test_case, db),
-                "executability_details": self._get_executability_details(test_case),
-                "coverage_details": self._get_coverage_details(test_case, db),
-                "clarity_details": self._get_clarity_details(test_case)
-            }
-            
-            # Generate suggestions
-            suggestions = self._generate_suggestions(test_case, {
-                "completeness": completeness,
-                "accuracy": accuracy,
-                "executability": executability,
-                "coverage": coverage,
-                "clarity": clarity
-            })
-            
-            result = EvaluationResult(
-                completeness_score=completeness,
-                accuracy_score=accuracy,
-                executability_score=executability,
-                coverage_score=coverage,
-                clarity_score=clarity,
-                total_score=total_score,
-                evaluation_details=evaluation_details,
-                suggestions=suggestions
-            )
+            result = self._compute_evaluation(test_case, db)
             
             # Save evaluation to database
             self._save_evaluation_to_db(result, test_case, db)
@@ -116,89 +151,202 @@ class QualityEvaluator:
             logger.error(f"Error evaluating test case {test_case.id}: {str(e)}")
             return self._get_default_evaluation()
     
-    def _evaluate_completeness(self, test_case: TestCase) -> float:
+    def _compute_evaluation(self, test_case: TestCase, db: Session) -> EvaluationResult:
+        """Score a test case without touching the database"""
+        # Build the shared content strings and scan them once
+        steps = test_case.test_steps or ""
+        result = test_case.expected_result or ""
+        content = self._join_content(test_case.description, steps, result)
+        steps_result_content = self._join_content(steps, result)
+        
+        completeness_facts = self._find_completeness_facts(test_case)
+        accuracy_terms = self._find_accuracy_terms(segmentation.cut(content))
+        executability_terms = self._find_executability_terms(steps, result)
+        covered_aspects = self._aspects_matcher.find(content)
+        clarity_terms = self._find_clarity_terms(steps_result_content)
+        
+        # Evaluate each dimension
+        completeness = self._evaluate_completeness(test_case, completeness_facts=completeness_facts)
+        accuracy = self._evaluate_accuracy(test_case, db, accuracy_terms=accuracy_terms)
+        executability = self._evaluate_executability(test_case, executability_terms=executability_terms)
+        coverage = self._evaluate_coverage(test_case, db, covered_aspects=covered_aspects)
+        clarity = self._evaluate_clarity(test_case, clarity_terms=clarity_terms)
+        
+        # Calculate total score
+        total_score = (
+            completeness * self.weights["completeness"] +
+            accuracy * self.weights["accuracy"] +
+            executability * self.weights["executability"] +
+            coverage * self.weights["coverage"] +
+            clarity * self.weights["clarity"]
+        )
+        
+        # Generate evaluation details
+        evaluation_details = {
+            "completeness_details": self._get_completeness_details(test_case, completeness_facts=completeness_facts),
+            "accuracy_details": self._get_accuracy_details(test_case, db, accuracy_terms=accuracy_terms, content=content),
+            "executability_details": self._get_executability_details(test_case, executability_terms=executability_terms),
+            "coverage_details": self._get_coverage_details(test_case, db, covered_aspects=covered_aspects),
+            "clarity_details": self._get_clarity_details(
+                test_case, content=steps_result_content, clarity_terms=clarity_terms
+            )
+        }
+        
+        # Generate suggestions
+        suggestions = self._generate_suggestions(test_case, {
+            "completeness": completeness,
+            "accuracy": accuracy,
+            "executability": executability,
+            "coverage": coverage,
+            "clarity": clarity
+        })
+        
+        return EvaluationResult(
+            completeness_score=completeness,
+            accuracy_score=accuracy,
+            executability_score=executability,
+            coverage_score=coverage,
+            clarity_score=clarity,
+            total_score=total_score,
+            evaluation_details=evaluation_details,
+            suggestions=suggestions
+        )
+    
+    @staticmethod
+    def _join_content(*parts: Optional[str]) -> str:
+        """Join the non-empty text fields of a test case with spaces"""
+        return " ".join(part for part in parts if part)
+    
+    def _find_completeness_facts(self, test_case: TestCase) -> Dict[str, Any]:
+        """Strip the text fields and count the numbered steps once"""
+        preconditions = (test_case.preconditions or "").strip()
+        test_steps = test_case.test_steps or ""
+        expected_result = (test_case.expected_result or "").strip()
+        
+        return {
+            "has_preconditions": len(preconditions) > 10,
+            "has_test_steps": len(test_steps.strip()) > 20,
+            "steps_count": sum(1 for _ in _STEPS_RE.finditer(test_steps)),
+            "has_expected_result": len(expected_result) > 10
+        }
+    
+    def _evaluate_completeness(
+        self,
+        test_case: TestCase,
+        completeness_facts: Optional[Dict[str, Any]] = None
+    ) -> float:
         """Evaluate completeness of test case (0-100)"""
         score = 0
         
+        if completeness_facts is None:
+            completeness_facts = self._find_completeness_facts(test_case)
+        
         # Check preconditions (30%)
-        if test_case.preconditions and len(test_case.preconditions.strip()) > 10:
+        if completeness_facts["has_preconditions"]:
             score += 30
         
         # Check test steps (40%)
-        if test_case.test_steps and len(test_case.test_steps.strip()) > 20:
-            steps_count = len(re.findall(r'\d+\.\s+', test_case.test_steps))
-            if steps_count >= 3:
-                score += 40
-            elif steps_count >= 2:
-                score += 30
-            elif steps_count >= 1:
-                score += 20
+        if completeness_facts["has_test_steps"]:
+            score += _ladder_points(completeness_facts["steps_count"], _STEPS_POINTS)
         
         # Check expected result (30%)
-        if test_case.expected_result and len(test_case.expected_result.strip()) > 10:
+        if completeness_facts["has_expected_result"]:
             score += 30
         
         return min(score, 100)
     
-    def _evaluate_accuracy(self, test_case: TestCase, db: Session) -> float:
+    def _find_accuracy_terms(self, tokens: List[str]) -> Dict[str, List[str]]:
+        """Collect technical terms, operations and measurements in a single pass over tokens"""
+        technical_terms = []
+        operations = []
+        measurements = []
+        
+        for token in tokens:
+            if token in self._acc_tech:
+                technical_terms.append(token)
+            elif token in self._acc_ops:
+                operations.append(token)
+            elif token in self._acc_meas:
+                measurements.append(token)
+        
+        return {
+            "technical_terms": technical_terms,
+            "operations": operations,
+            "measurements": measurements
+        }
+    
+    def _evaluate_accuracy(
+        self,
+        test_case: TestCase,
+        db: Session,
+        accuracy_terms: Optional[Dict[str, List[str]]] = None
+    ) -> float:
         """Evaluate accuracy of technical terms and operations"""
         score = 0
         
-        # Check technical term accuracy (40%)
-        content = f"{test_case.description} {test_case.test_steps} {test_case.expected_result}"
-        tokens = list(jieba.cut(content))
+        if accuracy_terms is None:
+            content = self._join_content(test_case.description, test_case.test_steps, test_case.expected_result)
+            accuracy_terms = self._find_accuracy_terms(segmentation.cut(content))
         
-        technical_terms_found = sum(1 for token in tokens if token in self.accuracy_keywords["technical_terms"])
-        if technical_terms_found >= 3:
-            score += 40
-        elif technical_terms_found >= 2:
-            score += 30
-        elif technical_terms_found >= 1:
-            score += 20
+        # Check technical term accuracy (40%)
+        score += _ladder_points(len(accuracy_terms["technical_terms"]), _TECHNICAL_TERM_POINTS)
         
         # Check operation accuracy (30%)
-        operations_found = sum(1 for token in tokens if token in self.accuracy_keywords["operations"])
-        if operations_found >= 3:
-            score += 30
-        elif operations_found >= 2:
-            score += 20
-        elif operations_found >= 1:
-            score += 10
+        score += _ladder_points(len(accuracy_terms["operations"]), _OPERATION_POINTS)
         
         # Check measurement accuracy (30%)
-        measurements_found = sum(1 for token in tokens if token in self.accuracy_keywords["measurements"])
-        if measurements_found >= 2:
-            score += 30
-        elif measurements_found >= 1:
-            score += 20
+        score += _ladder_points(len(accuracy_terms["measurements"]), _MEASUREMENT_POINTS)
         
         return min(score, 100)
     
-    def _evaluate_executability(self, test_case: TestCase) -> float:
+    def _find_executability_terms(self, steps: str, result: str) -> Dict[str, List[str]]:
+        """Collect actionable keywords in the steps and verifiable keywords in the result"""
+        return {
+            "actionable": self._actionable_matcher.find(steps),
+            "verifiable": self._verifiable_matcher.find(result)
+        }
+    
+    def _find_clarity_terms(self, content: str) -> Dict[str, List[str]]:
+        """Collect clear and ambiguous expressions in the steps and result"""
+        return {
+            "clear_actions": self._clear_actions_matcher.find(content),
+            "ambiguous": self._ambiguous_matcher.find(content)
+        }
+    
+    def _evaluate_executability(
+        self,
+        test_case: TestCase,
+        executability_terms: Optional[Dict[str, List[str]]] = None
+    ) -> float:
         """Evaluate if test case is executable"""
         score = 0
         
+        if executability_terms is None:
+            # Only the thresholds matter here, so stop counting once the top one is reached
+            actionable_count = self._actionable_matcher.count(
+                test_case.test_steps or "", limit=_ACTIONABLE_POINTS[0][0]
+            )
+            verifiable_count = self._verifiable_matcher.count(
+                test_case.expected_result or "", limit=_VERIFIABLE_POINTS[0][0]
+            )
+        else:
+            actionable_count = len(executability_terms["actionable"])
+            verifiable_count = len(executability_terms["verifiable"])
+        
         # Check actionable steps (60%)
-        steps_content = test_case.test_steps or ""
-        actionable_count = sum(1 for keyword in self.executability_keywords["actionable"] if keyword in steps_content)
-        if actionable_count >= 3:
-            score += 60
-        elif actionable_count >= 2:
-            score += 45
-        elif actionable_count >= 1:
-            score += 30
+        score += _ladder_points(actionable_count, _ACTIONABLE_POINTS)
         
         # Check verifiable results (40%)
-        result_content = test_case.expected_result or ""
-        verifiable_count = sum(1 for keyword in self.executability_keywords["verifiable"] if keyword in result_content)
-        if verifiable_count >= 2:
-            score += 40
-        elif verifiable_count >= 1:
-            score += 25
+        score += _ladder_points(verifiable_count, _VERIFIABLE_POINTS)
         
         return min(score, 100)
     
-    def _evaluate_coverage(self, test_case: TestCase, db: Session) -> float:
+    def _evaluate_coverage(
+        self,
+        test_case: TestCase,
+        db: Session,
+        covered_aspects: Optional[List[str]] = None
+    ) -> float:
         """Evaluate test coverage"""
         score = 0
         
@@ -207,31 +355,36 @@ class QualityEvaluator:
             score += 50
         
         # Check aspect coverage (50%)
-        content = f"{test_case.description} {test_case.test_steps} {test_case.expected_result}"
-        aspects_found = sum(1 for aspect in self.coverage_keywords["test_aspects"] if aspect in content)
-        if aspects_found >= 3:
-            score += 50
-        elif aspects_found >= 2:
-            score += 35
-        elif aspects_found >= 1:
-            score += 20
+        if covered_aspects is None:
+            content = self._join_content(test_case.description, test_case.test_steps, test_case.expected_result)
+            aspects_found = self._aspects_matcher.count(content, limit=_ASPECT_POINTS[0][0])
+        else:
+            aspects_found = len(covered_aspects)
+        score += _ladder_points(aspects_found, _ASPECT_POINTS)
         
         return min(score, 100)
     
-    def _evaluate_clarity(self, test_case: TestCase) -> float:
+    def _evaluate_clarity(
+        self,
+        test_case: TestCase,
+        clarity_terms: Optional[Dict[str, List[str]]] = None
+    ) -> float:
         """Evaluate clarity of test case"""
         score = 0
         
+        if clarity_terms is None:
+            content = self._join_content(test_case.test_steps, test_case.expected_result)
+            clear_actions = self._clear_actions_matcher.count(content, limit=_CLEAR_ACTION_POINTS[0][0])
+            # Anything above one ambiguous expression scores the same
+            ambiguous_count = self._ambiguous_matcher.count(content, limit=2)
+        else:
+            clear_actions = len(clarity_terms["clear_actions"])
+            ambiguous_count = len(clarity_terms["ambiguous"])
+        
         # Check for clear actions (60%)
-        content = f"{test_case.test_steps} {test_case.expected_result}"
-        clear_actions = sum(1 for keyword in self.clarity_keywords["clear_actions"] if keyword in content)
-        if clear_actions >= 2:
-            score += 60
-        elif clear_actions >= 1:
-            score += 40
+        score += _ladder_points(clear_actions, _CLEAR_ACTION_POINTS)
         
         # Check for ambiguous language (40% - negative scoring)
-        ambiguous_count = sum(1 for keyword in self.clarity_keywords["ambiguous"] if keyword in content)
         if ambiguous_count == 0:
             score += 40
         elif ambiguous_count <= 1:
@@ -239,49 +392,87 @@ class QualityEvaluator:
         
         return min(score, 100)
     
-    def _get_completeness_details(self, test_case: TestCase) -> Dict[str, Any]:
+    def _get_completeness_details(
+        self,
+        test_case: TestCase,
+        completeness_facts: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """Get detailed completeness analysis"""
+        if completeness_facts is None:
+            completeness_facts = self._find_completeness_facts(test_case)
         return {
-            "has_preconditions": bool(test_case.preconditions and len(test_case.preconditions.strip()) > 10),
-            "steps_count": len(re.findall(r'\d+\.\s+', test_case.test_steps or "")),
-            "has_expected_result": bool(test_case.expected_result and len(test_case.expected_result.strip()) > 10),
-            "missing_elements": self._identify_missing_elements(test_case)
+            "has_preconditions": completeness_facts["has_preconditions"],
+            "steps_count": completeness_facts["steps_count"],
+            "has_expected_result": completeness_facts["has_expected_result"],
+            "missing_elements": self._identify_missing_elements(test_case, completeness_facts=completeness_facts)
         }
     
-    def _get_accuracy_details(self, test_case: TestCase, db: Session) -> Dict[str, Any]:
+    def _get_accuracy_details(
+        self,
+        test_case: TestCase,
+        db: Session,
+        accuracy_terms: Optional[Dict[str, List[str]]] = None,
+        content: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Get detailed accuracy analysis"""
-        content = f"{test_case.description} {test_case.test_steps} {test_case.expected_result}"
-        tokens = list(jieba.cut(content))
+        if content is None:
+            content = self._join_content(test_case.description, test_case.test_steps, test_case.expected_result)
+        if accuracy_terms is None:
+            accuracy_terms = self._find_accuracy_terms(segmentation.cut(content))
         
         return {
-            "technical_terms_found": [token for token in tokens if token in self.accuracy_keywords["technical_terms"]],
-            "operations_found": [token for token in tokens if token in self.accuracy_keywords["operations"]],
-            "measurements_found": [token for token in tokens if token in self.accuracy_keywords["measurements"]],
+            "technical_terms_found": accuracy_terms["technical_terms"],
+            "operations_found": accuracy_terms["operations"],
+            "measurements_found": accuracy_terms["measurements"],
             "potential_errors": self._identify_potential_errors(content)
         }
     
-    def _get_executability_details(self, test_case: TestCase) -> Dict[str, Any]:
+    def _get_executability_details(
+        self,
+        test_case: TestCase,
+        executability_terms: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, Any]:
         """Get detailed executability analysis"""
+        if executability_terms is None:
+            executability_terms = self._find_executability_terms(
+                test_case.test_steps or "", test_case.expected_result or ""
+            )
         return {
-            "actionable_steps": [keyword for keyword in self.executability_keywords["actionable"] if keyword in (test_case.test_steps or "")],
-            "verifiable_results": [keyword for keyword in self.executability_keywords["verifiable"] if keyword in (test_case.expected_result or "")],
+            "actionable_steps": executability_terms["actionable"],
+            "verifiable_results": executability_terms["verifiable"],
             "execution_challenges": self._identify_execution_challenges(test_case)
         }
     
-    def _get_coverage_details(self, test_case: TestCase, db: Session) -> Dict[str, Any]:
+    def _get_coverage_details(
+        self,
+        test_case: TestCase,
+        db: Session,
+        covered_aspects: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """Get detailed coverage analysis"""
+        if covered_aspects is None:
+            content = self._join_content(test_case.description, test_case.test_steps, test_case.expected_result)
+            covered_aspects = self._aspects_matcher.find(content)
         return {
             "test_type": test_case.test_type,
-            "covered_aspects": [aspect for aspect in self.coverage_keywords["test_aspects"] if aspect in f"{test_case.description} {test_case.test_steps} {test_case.expected_result}"],
+            "covered_aspects": covered_aspects,
             "missing_coverage": self._identify_missing_coverage(test_case, db)
         }
     
-    def _get_clarity_details(self, test_case: TestCase) -> Dict[str, Any]:
+    def _get_clarity_details(
+        self,
+        test_case: TestCase,
+        content: Optional[str] = None,
+        clarity_terms: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, Any]:
         """Get detailed clarity analysis"""
-        content = f"{test_case.test_steps} {test_case.expected_result}"
+        if content is None:
+            content = self._join_content(test_case.test_steps, test_case.expected_result)
+        if clarity_terms is None:
+            clarity_terms = self._find_clarity_terms(content)
         return {
-            "clear_elements": [keyword for keyword in self.clarity_keywords["clear_actions"] if keyword in content],
-            "ambiguous_elements": [keyword for keyword in self.clarity_keywords["ambiguous"] if keyword in content],
+            "clear_elements": clarity_terms["clear_actions"],
+            "ambiguous_elements": clarity_terms["ambiguous"],
             "clarity_issues": self._identify_clarity_issues(content)
         }
     
@@ -306,17 +497,24 @@ class QualityEvaluator:
         
         return suggestions
     
-    def _identify_missing_elements(self, test_case: TestCase) -> List[str]:
+    def _identify_missing_elements(
+        self,
+        test_case: TestCase,
+        completeness_facts: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
         """Identify missing elements in test case"""
         missing = []
         
-        if not test_case.preconditions or len(test_case.preconditions.strip()) <= 10:
+        if completeness_facts is None:
+            completeness_facts = self._find_completeness_facts(test_case)
+        
+        if not completeness_facts["has_preconditions"]:
             missing.append("前置条件")
         
-        if not test_case.test_steps or len(re.findall(r'\d+\.\s+', test_case.test_steps)) < 2:
+        if completeness_facts["steps_count"] < 2:
             missing.append("详细测试步骤")
         
-        if not test_case.expected_result or len(test_case.expected_result.strip()) <= 10:
+        if not completeness_facts["has_expected_result"]:
             missing.append("预期结果")
         
         return missing
@@ -326,11 +524,8 @@ class QualityEvaluator:
         errors = []
         
         # Check for common typos or inconsistencies
-        if "坐椅" in content:
-            errors.append("可能的错别字：'坐椅' 应为 '座椅'")
-        
-        if "点机" in content:
-            errors.append("可能的错别字：'点机' 应为 '点击'")
+        for typo in self._typo_matcher.find(content):
+            errors.append(f"可能的错别字：'{typo}' 应为 '{_COMMON_TYPOS[typo]}'")
         
         return errors
     
@@ -370,6 +565,20 @@ class QualityEvaluator:
         
         return issues
     
+    def _build_evaluation_record(self, result: EvaluationResult, test_case_id: int) -> TestCaseEvaluation:
+        """Build the database row for an evaluation result"""
+        return TestCaseEvaluation(
+            test_case_id=test_case_id,
+            completeness_score=result.completeness_score,
+            accuracy_score=result.accuracy_score,
+            executability_score=result.executability_score,
+            coverage_score=result.coverage_score,
+            clarity_score=result.clarity_score,
+            total_score=result.total_score,
+            evaluation_details=result.evaluation_details,
+            suggestions=result.suggestions
+        )
+    
     def _save_evaluation_to_db(self, result: EvaluationResult, test_case: TestCase, db: Session):
         """Save evaluation result to database"""
         try:
@@ -377,19 +586,7 @@ class QualityEvaluator:
             db.query(TestCaseEvaluation).filter(TestCaseEvaluation.test_case_id == test_case.id).delete()
             
             # Create new evaluation
-            evaluation = TestCaseEvaluation(
-                test_case_id=test_case.id,
-                completeness_score=result.completeness_score,
-                accuracy_score=result.accuracy_score,
-                executability_score=result.executability_score,
-                coverage_score=result.coverage_score,
-                clarity_score=result.clarity_score,
-                total_score=result.total_score,
-                evaluation_details=result.evaluation_details,
-                suggestions=result.suggestions
-            )
-            
-            db.add(evaluation)
+            db.add(self._build_evaluation_record(result, test_case.id))
             db.commit()
             
             logger.info(f"Saved evaluation for test case {test_case.id}")
@@ -400,25 +597,65 @@ class QualityEvaluator:
     
     def _get_default_evaluation(self) -> EvaluationResult:
         """Get default evaluation result for error cases"""
-        return EvaluationResult(
-            completeness_score=0,
-            accuracy_score=0,
-            executability_score=0,
-            coverage_score=0,
-            clarity_score=0,
-            total_score=0,
-            evaluation_details={},
-            suggestions=["评估过程中出现错误，请重新评估"]
-        )
+        return _DEFAULT_EVALUATION
+    
+    def _save_evaluations_to_db(self, results: Dict[int, EvaluationResult], db: Session):
+        """Replace the evaluations of several test cases in one transaction"""
+        if not results:
+            return
+        
+        try:
+            db.query(TestCaseEvaluation).filter(
+                TestCaseEvaluation.test_case_id.in_(list(results))
+            ).delete(synchronize_session=False)
+            
+            db.bulk_save_objects([
+                self._build_evaluation_record(result, test_case_id)
+                for test_case_id, result in results.items()
+            ])
+            db.commit()
+            
+            logger.info(f"Saved evaluations for {len(results)} test cases")
+            
+        except Exception as e:
+            logger.error(f"Error saving evaluations to database: {str(e)}")
+            db.rollback()
     
     def batch_evaluate(self, test_case_ids: List[int], db: Session) -> Dict[int, EvaluationResult]:
         """Batch evaluate multiple test cases"""
-        results = {}
+        scored = {}
+        evaluated = {}
+        
+        # Stream the rows in chunks so only the scores, not every TestCase, stay in memory
+        test_cases = (
+            db.query(TestCase)
+            # Scoring reads columns only; fail loudly on an accidental per-row lazy load
+            .options(raiseload("*"))
+            .filter(TestCase.id.in_(test_case_ids))
+            .execution_options(stream_results=True)
+            .yield_per(BATCH_EVALUATE_CHUNK_SIZE)
+        )
+        for test_case in test_cases:
+            try:
+                result = self._compute_evaluation(test_case, db)
+                evaluated[test_case.id] = result
+            except Exception as e:
+                logger.error(f"Error evaluating test case {test_case.id}: {str(e)}")
+                result = self._get_default_evaluation()
+            
+            scored[test_case.id] = result
+        
+        # Return results in input order, once per existing test case
+        results = {
+            test_case_id: scored[test_case_id]
+            for test_case_id in test_case_ids
+            if test_case_id in scored
+        }
         
-        for test_case_id in test_case_ids:
-            test_case = db.query(TestCase).filter(TestCase.id == test_case_id).first()
-            if test_case:
-                result = self.evaluate_test_case(test_case, db)
-                results[test_case_id] = result
+        # Save all successful evaluations with a single commit
+        self._save_evaluations_to_db(evaluated, db)
         
-        return results
\ No newline at end of file
+        return results
+
+
+QualityEvaluator._prepare_keywords()
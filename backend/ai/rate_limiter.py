@@ -0,0 +1,34 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket limiting how many requests start per minute, shared across threads"""
+
+    def __init__(self, requests_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self._interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._tokens = float(max(requests_per_minute, 0))
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may start; returns at once when unlimited"""
+        if self._interval == 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    float(self.requests_per_minute),
+                    self._tokens + (now - self._updated_at) / self._interval,
+                )
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) * self._interval
+
+            time.sleep(wait_time)
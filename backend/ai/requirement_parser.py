@@ -1,14 +1,29 @@
 import re
-import jieba
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from dataclasses import dataclass
 from sqlalchemy.orm import Session
 from ..models import ParsedFeature, Requirement
 from ..config import settings
+from .keyword_matcher import get_keyword_matcher
+from . import segmentation
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns shared by all parser instances
+_SENT_END_RE = re.compile(r'[。！？.!?]')
+# Numbers with an optional unit, or followed by a range separator; the upper
+# bound of a range is only looked ahead at so it is still matched as a number
+_NUMBER_RE = re.compile(
+    r'(?P<value>\d+(?:\.\d+)?)\s*'
+    r'(?:(?P<unit>[°%秒分钟小时毫米厘米])|[-~到至]\s*(?=(?P<upper>\d+(?:\.\d+)?)))?'
+)
+_TIME_RE = re.compile(r'(\d+)\s*(秒|分钟|小时)')
+_ACTION_RE = re.compile(r'(\w+)(调节|控制|设置|操作)')
+_DEP_RE = re.compile(r'(\w+功能|\w+系统|\w+模块)')
+_EXCEPTION_HINT_RE = re.compile(r'异常|错误')
+_PERFORMANCE_HINT_RE = re.compile(r'性能|速度')
+
 @dataclass
 class FeatureInfo:
     name: str
@@ -21,35 +36,57 @@ class FeatureInfo:
 
 
 class RequirementParser:
-    def __init__(self):
-        # Initialize Chinese word segmentation
-        jieba.initialize()
-        
-        # Define seat function keywords
-        self.seat_functions = {
-            "电动调节": ["电动", "调节", "前后", "上下", "靠背", "角度", "高度"],
-            "记忆功能": ["记忆", "存储", "位置", "用户", "设置", "自动"],
-            "加热功能": ["加热", "温度", "控制", "调温", "保温"],
-            "通风功能": ["通风", "风扇", "换气", "散热", "吹风"],
-            "按摩功能": ["按摩", "震动", "模式", "强度", "节奏"],
-            "安全功能": ["安全", "保护", "防夹", "过载", "故障", "检测"]
+    # Keyword tables and the matchers derived from them are built once per
+    # process and shared by every instance
+    
+    # Define seat function keywords
+    seat_functions = {
+        "电动调节": ["电动", "调节", "前后", "上下", "靠背", "角度", "高度"],
+        "记忆功能": ["记忆", "存储", "位置", "用户", "设置", "自动"],
+        "加热功能": ["加热", "温度", "控制", "调温", "保温"],
+        "通风功能": ["通风", "风扇", "换气", "散热", "吹风"],
+        "按摩功能": ["按摩", "震动", "模式", "强度", "节奏"],
+        "安全功能": ["安全", "保护", "防夹", "过载", "故障", "检测"]
+    }
+    
+    # Define test types
+    test_types = {
+        "功能测试": ["功能", "正常", "基本", "操作"],
+        "边界测试": ["边界", "极限", "最大", "最小", "范围"],
+        "异常测试": ["异常", "错误", "故障", "失败", "中断"],
+        "性能测试": ["性能", "速度", "响应", "时间", "效率"],
+        "安全测试": ["安全", "防护", "保护", "风险"]
+    }
+    
+    # Define priority keywords
+    priority_keywords = {
+        "high": ["重要", "关键", "核心", "必须", "紧急"],
+        "medium": ["一般", "普通", "常规", "标准"],
+        "low": ["次要", "可选", "建议", "补充"]
+    }
+    
+    @classmethod
+    def _prepare_keywords(cls):
+        """Build the matchers and frozen keyword sets shared by all instances"""
+        # Multi-keyword matchers for the substring scans (built from the ordered lists)
+        cls._priority_matchers = {
+            priority: get_keyword_matcher(tuple(keywords))
+            for priority, keywords in cls.priority_keywords.items()
         }
+        cls._safety_matcher = get_keyword_matcher(("不能", "禁止", "不允许", "不得"))
+        cls._concurrency_matcher = get_keyword_matcher(("同时", "并发", "冲突"))
+        cls._dependency_matcher = get_keyword_matcher(("依赖", "需要", "要求", "基于", "前提"))
         
-        # Define test types
-        self.test_types = {
-            "功能测试": ["功能", "正常", "基本", "操作"],
-            "边界测试": ["边界", "极限", "最大", "最小", "范围"],
-            "异常测试": ["异常", "错误", "故障", "失败", "中断"],
-            "性能测试": ["性能", "速度", "响应", "时间", "效率"],
-            "安全测试": ["安全", "防护", "保护", "风险"]
-        }
+        # Keep every keyword a single token in the segmentation output
+        # (the jieba dictionary itself is loaded on first use)
+        for keyword_groups in (cls.seat_functions, cls.test_types, cls.priority_keywords):
+            for keywords in keyword_groups.values():
+                segmentation.register_words(keywords)
         
-        # Define priority keywords
-        self.priority_keywords = {
-            "high": ["重要", "关键", "核心", "必须", "紧急"],
-            "medium": ["一般", "普通", "常规", "标准"],
-            "low": ["次要", "可选", "建议", "补充"]
-        }
+        # Freeze the keyword lists for O(1) membership checks
+        for keyword_groups in (cls.seat_functions, cls.test_types, cls.priority_keywords):
+            for key, keywords in keyword_groups.items():
+                keyword_groups[key] = frozenset(keywords)
     
     def parse_requirement(self, requirement: Requirement, db: Session) -> List[FeatureInfo]:
         """Parse a requirement and extract features"""
@@ -57,8 +94,8 @@ class RequirementParser:
             content = requirement.content
             features = []
             
-            # Split content into sentences
-            sentences = self._split_sentences(content)
+            # Split content into sentences lazily
+            sentences = self._iter_sentences(content)
             
             # Extract features from each sentence
             for sentence in sentences:
@@ -77,17 +114,30 @@ class RequirementParser:
     
     def _split_sentences(self, content: str) -> List[str]:
         """Split content into sentences"""
+        return list(self._iter_sentences(content))
+    
+    def _iter_sentences(self, content: str) -> Iterator[str]:
+        """Yield the non-empty sentences of content one at a time"""
         # Simple sentence splitting for Chinese and English
-        sentences = re.split(r'[。！？\.\!\?]', content)
-        return [s.strip() for s in sentences if s.strip()]
+        start = 0
+        for match in _SENT_END_RE.finditer(content):
+            sentence = content[start:match.start()].strip()
+            start = match.end()
+            if sentence:
+                yield sentence
+        
+        sentence = content[start:].strip()
+        if sentence:
+            yield sentence
     
     def _extract_feature_from_sentence(self, sentence: str) -> Optional[FeatureInfo]:
         """Extract feature information from a sentence"""
         # Tokenize the sentence
-        tokens = list(jieba.cut(sentence))
+        tokens = segmentation.cut(sentence)
+        token_set = set(tokens)
         
         # Find function type
-        function_type = self._identify_function_type(tokens)
+        function_type = self._identify_function_type(token_set)
         if not function_type:
             return None
         
@@ -116,10 +166,12 @@ class RequirementParser:
             priority=priority
         )
     
-    def _identify_function_type(self, tokens: List[str]) -> Optional[str]:
+    def _identify_function_type(self, tokens: Iterable[str]) -> Optional[str]:
         """Identify the function type based on tokens"""
+        # Hash the tokens once instead of once per function type
+        token_set = tokens if isinstance(tokens, (set, frozenset)) else set(tokens)
         for function_type, keywords in self.seat_functions.items():
-            if any(keyword in tokens for keyword in keywords):
+            if not keywords.isdisjoint(token_set):
                 return function_type
         return None
     
@@ -130,7 +182,7 @@ class RequirementParser:
             return function_type
         
         # Try to find action words
-        action_words = re.findall(r'(\w+)(调节|控制|设置|操作)', sentence)
+        action_words = _ACTION_RE.findall(sentence)
         if action_words:
             return f"{action_words[0][0]}{action_words[0][1]}"
         
@@ -139,15 +191,21 @@ class RequirementParser:
     def _extract_parameters(self, sentence: str, tokens: List[str]) -> Dict[str, Any]:
         """Extract parameters from sentence"""
         parameters = {}
+        ranges = []
+        upper_start = -1
         
-        # Extract numerical parameters
-        numbers = re.findall(r'(\d+(?:\.\d+)?)\s*([°%秒分钟小时毫米厘米]?)', sentence)
-        for value, unit in numbers:
+        # Extract numerical and range parameters in one pass
+        for match in _NUMBER_RE.finditer(sentence):
+            unit = match.group("unit")
             if unit:
-                parameters[f"value_{unit}"] = float(value)
+                parameters[f"value_{unit}"] = float(match.group("value"))
+            
+            # The upper bound of a range cannot start another range
+            upper = match.group("upper")
+            if upper is not None and match.start() != upper_start:
+                ranges.append((match.group("value"), upper))
+                upper_start = match.start("upper")
         
-        # Extract range parameters
-        ranges = re.findall(r'(\d+(?:\.\d+)?)\s*[-~到至]\s*(\d+(?:\.\d+)?)', sentence)
         for min_val, max_val in ranges:
             parameters["min_value"] = float(min_val)
             parameters["max_value"] = float(max_val)
@@ -159,16 +217,16 @@ class RequirementParser:
         constraints = {}
         
         # Extract time constraints
-        time_constraints = re.findall(r'(\d+)\s*(秒|分钟|小时)', sentence)
+        time_constraints = _TIME_RE.findall(sentence)
         for value, unit in time_constraints:
             constraints[f"time_{unit}"] = int(value)
         
         # Extract safety constraints
-        if any(word in sentence for word in ["不能", "禁止", "不允许", "不得"]):
+        if self._safety_matcher.contains_any(sentence):
             constraints["safety_restriction"] = True
         
         # Extract operational constraints
-        if any(word in sentence for word in ["同时", "并发", "冲突"]):
+        if self._concurrency_matcher.contains_any(sentence):
             constraints["concurrent_operation"] = True
         
         return constraints
@@ -178,24 +236,22 @@ class RequirementParser:
         dependencies = []
         
         # Look for dependency keywords
-        dependency_keywords = ["依赖", "需要", "要求", "基于", "前提"]
-        for keyword in dependency_keywords:
-            if keyword in sentence:
-                # Try to find what it depends on
-                parts = sentence.split(keyword)
-                if len(parts) > 1:
-                    dep_part = parts[1].strip()
-                    # Extract the dependency (simplified)
-                    dep_match = re.search(r'(\w+功能|\w+系统|\w+模块)', dep_part)
-                    if dep_match:
-                        dependencies.append(dep_match.group(1))
+        for keyword in self._dependency_matcher.find(sentence):
+            # Try to find what it depends on
+            parts = sentence.split(keyword)
+            if len(parts) > 1:
+                dep_part = parts[1].strip()
+                # Extract the dependency (simplified)
+                dep_match = _DEP_RE.search(dep_part)
+                if dep_match:
+                    dependencies.append(dep_match.group(1))
         
         return dependencies
     
     def _determine_priority(self, sentence: str, tokens: List[str]) -> str:
         """Determine priority based on sentence content"""
-        for priority, keywords in self.priority_keywords.items():
-            if any(keyword in sentence for keyword in keywords):
+        for priority, matcher in self._priority_matchers.items():
+            if matcher.contains_any(sentence):
                 return priority
         
         # Default priority
@@ -207,19 +263,20 @@ class RequirementParser:
             # Delete existing features for this requirement
             db.query(ParsedFeature).filter(ParsedFeature.requirement_id == requirement_id).delete()
             
-            # Add new features
-            for feature in features:
-                db_feature = ParsedFeature(
-                    requirement_id=requirement_id,
-                    feature_name=feature.name,
-                    feature_type=feature.type,
-                    description=feature.description,
-                    parameters=feature.parameters,
-                    constraints=feature.constraints,
-                    dependencies=feature.dependencies,
-                    priority=feature.priority
-                )
-                db.add(db_feature)
+            # Add new features in a single bulk insert
+            db.bulk_insert_mappings(ParsedFeature, [
+                {
+                    "requirement_id": requirement_id,
+                    "feature_name": feature.name,
+                    "feature_type": feature.type,
+                    "description": feature.description,
+                    "parameters": feature.parameters,
+                    "constraints": feature.constraints,
+                    "dependencies": feature.dependencies,
+                    "priority": feature.priority
+                }
+                for feature in features
+            ])
             
             db.commit()
             logger.info(f"Saved {len(features)} features for requirement {requirement_id}")
@@ -242,10 +299,13 @@ class RequirementParser:
         if feature.parameters:
             suggestions.append("边界测试")
         
-        if "异常" in feature.description or "错误" in feature.description:
+        if _EXCEPTION_HINT_RE.search(feature.description):
             suggestions.append("异常测试")
         
-        if "性能" in feature.description or "速度" in feature.description:
+        if _PERFORMANCE_HINT_RE.search(feature.description):
             suggestions.append("性能测试")
         
-        return suggestions
\ No newline at end of file
+        return suggestions
+
+
+RequirementParser._prepare_keywords()
@@ -0,0 +1,50 @@
+import threading
+from typing import Iterable, List, Set
+
+try:
+    import jieba_fast as jieba  # Optional C implementation with the same API
+except Exception:
+    import jieba  # Fallback to the pure Python implementation
+
+_registered_words: Set[str] = set()
+_pending_words: Set[str] = set()
+# Handlers run in a threadpool, so the first requests may segment concurrently
+_lock = threading.Lock()
+
+
+def initialize():
+    """Load the jieba dictionary once per process and add pending keywords"""
+    with _lock:
+        if not jieba.dt.initialized:
+            jieba.initialize()
+
+        while _pending_words:
+            word = _pending_words.pop()
+            jieba.add_word(word)
+            _registered_words.add(word)
+
+
+def register_words(words: Iterable[str]):
+    """Make sure every keyword is segmented as a single token
+
+    Words are only queued here; they are added to the dictionary the first
+    time text is segmented, so constructing a parser or evaluator does not
+    load the jieba dictionary.
+    """
+    with _lock:
+        for word in words:
+            if word not in _registered_words:
+                _pending_words.add(word)
+
+
+def cut(text: str) -> List[str]:
+    """Segment text without the HMM pass for unknown words
+
+    Only dictionary keywords are ever looked up in the tokens, so the
+    Viterbi fallback for out-of-vocabulary characters adds cost without
+    changing any result.
+    """
+    # Checked again under the lock in initialize()
+    if _pending_words or not jieba.dt.initialized:
+        initialize()
+    return jieba.lcut(text, HMM=False)
@@ -1,8 +1,13 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, wait
 from sqlalchemy.orm import Session
 from ..models import TestCase, ParsedFeature, Requirement
 from ..config import settings
+from .llm_cache import LLMCache, make_cache_key
+from .keyword_matcher import KeywordMatcher
+from .rate_limiter import RateLimiter
 import logging
 import json
 import time
@@ -10,9 +15,143 @@ try:
     from openai import OpenAI  # Optional dependency
 except Exception:
     OpenAI = None  # Fallback when OpenAI SDK is not installed
+try:
+    import orjson  # Optional faster JSON codec
+except Exception:
+    orjson = None  # Fallback to the standard library json module
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on LLM requests in flight for one generation run
+MAX_CONCURRENT_LLM_CALLS = 10
+
+LLM_MODEL = "gpt-3.5-turbo"
+LLM_TEMPERATURE = settings.llm_temperature
+# Only deterministic sampling gives identical prompts identical answers, so
+# completions are cached only when the temperature is 0
+LLM_CACHE_ENABLED = LLM_TEMPERATURE == 0
+# Completion budget for one test case; a batched call gets one per requested type
+LLM_MAX_TOKENS_PER_CASE = 1000
+
+# Test case types for systematic generation
+TEST_TYPES = [
+    "function",
+    "boundary",
+    "exception",
+    "performance",
+    "security",
+]
+
+# System prompt for LLM test case generation; kept free of request data so
+# every call sends an identical prefix
+SYSTEM_PROMPT = """你是一个专业的汽车座椅软件测试专家。你的任务是根据给定的功能需求生成高质量的测试用例。
+
+请严格按照以下JSON格式返回测试用例，"cases" 数组中每种请求的测试类型各一个对象：
+{
+  "cases": [
+    {
+      "title": "测试用例标题",
+      "description": "测试用例描述",
+      "test_type": "测试类型(function/boundary/exception/performance/security)",
+      "preconditions": "前置条件",
+      "test_steps": "测试步骤",
+      "expected_result": "预期结果",
+      "priority": "优先级(high/medium/low)"
+    }
+  ]
+}
+
+测试用例要求：
+1. 针对汽车座椅软件系统的特定功能
+2. 包含完整的测试步骤和预期结果
+3. 考虑安全性、性能、边界条件等多个方面
+4. 使用专业的测试术语和规范
+5. 符合汽车行业标准和安全要求
+
+请确保测试用例具有可执行性、完整性和准确性。"""
+
+# Fixed head of every user prompt; request-specific fields are appended after it
+USER_PROMPT_INSTRUCTIONS = (
+    "根据以下功能需求信息，为列出的每种测试类型各生成一个测试用例，"
+    "确保测试用例详细并符合汽车座椅软件系统的专业要求。"
+    '请按系统提示中的 {"cases": [...]} JSON格式返回：'
+)
+
+# Fallback test case templates per test type; "{name}" is the feature name
+FALLBACK_TEMPLATES = {
+    "function": {
+        "title": "{name}功能测试",
+        "description": "验证{name}的基本功能",
+        "preconditions": "1. 系统正常启动\n2. 座椅处于默认位置\n3. 电源正常供应",
+        "test_steps": "1. 启动{name}功能\n2. 执行基本操作\n3. 观察系统响应\n4. 验证功能正常",
+        "expected_result": "{name}功能正常工作，系统响应符合预期",
+    },
+    "boundary": {
+        "title": "{name}边界测试",
+        "description": "验证{name}在边界条件下的行为",
+        "preconditions": "1. 系统正常启动\n2. 座椅处于默认位置\n3. 电源正常供应",
+        "test_steps": "1. 设置参数为最大值\n2. 执行{name}操作\n3. 设置参数为最小值\n4. 再次执行操作",
+        "expected_result": "系统在边界值下正常工作，不出现异常",
+    },
+    "exception": {
+        "title": "{name}异常测试",
+        "description": "验证{name}的异常处理能力",
+        "preconditions": "1. 系统正常启动\n2. 座椅处于默认位置",
+        "test_steps": "1. 创建异常条件\n2. 执行{name}操作\n3. 观察系统响应\n4. 验证错误处理",
+        "expected_result": "系统能够正确处理异常情况，给出适当提示",
+    },
+    "performance": {
+        "title": "{name}性能测试",
+        "description": "验证{name}的性能指标",
+        "preconditions": "1. 系统正常启动\n2. 座椅处于默认位置\n3. 性能监控工具准备",
+        "test_steps": "1. 启动性能监控\n2. 执行{name}操作\n3. 记录响应时间\n4. 分析性能数据",
+        "expected_result": "响应时间在2秒内，性能指标符合要求",
+    },
+    "security": {
+        "title": "{name}安全测试",
+        "description": "验证{name}的安全保护机制",
+        "preconditions": "1. 系统正常启动\n2. 座椅处于默认位置\n3. 安全测试环境准备",
+        "test_steps": "1. 在安全条件下执行{name}\n2. 观察安全机制响应\n3. 验证保护措施\n4. 检查安全日志",
+        "expected_result": "安全保护机制正常工作，有效防护风险",
+    },
+}
+
+def _json_loads(data: str) -> Any:
+    """Decode JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data: Any) -> str:
+    """Encode JSON without escaping non-ASCII text, using orjson when available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data).decode("utf-8")
+        except orjson.JSONEncodeError:
+            pass  # e.g. non-string keys, which json converts
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _is_json(data: str) -> bool:
+    """Return whether data decodes as JSON"""
+    try:
+        _json_loads(data)
+    except ValueError:
+        return False
+    return True
+
+
+# Request throttle shared by every generator instance in the process
+_llm_rate_limiter = RateLimiter(settings.openai_requests_per_minute)
+
+# Completions shared by every generator instance in the process
+_llm_cache = LLMCache(
+    maxsize=settings.llm_cache_size,
+    ttl=settings.llm_cache_ttl,
+    redis_url=settings.llm_cache_redis_url,
+)
+
 
 @dataclass
 class TestCaseInfo:
@@ -25,9 +164,105 @@ class TestCaseInfo:
     priority: str
 
 
+@dataclass(frozen=True)
+class FeatureSnapshot:
+    """Plain copy of the ParsedFeature fields used for generation
+
+    Worker threads only ever see these, never the ORM objects, so a thread
+    still running after the timeout cannot trigger a lazy load on the
+    request's Session once it has committed or closed.
+    """
+
+    id: Optional[int]
+    feature_name: str
+    feature_type: Optional[str]
+    description: Optional[str]
+    parameters: Optional[Dict[str, Any]]
+    priority: Optional[str]
+
+    @classmethod
+    def from_feature(cls, feature: ParsedFeature) -> "FeatureSnapshot":
+        return cls(
+            id=feature.id,
+            feature_name=feature.feature_name,
+            feature_type=feature.feature_type,
+            description=feature.description,
+            parameters=(
+                dict(feature.parameters) if feature.parameters else feature.parameters
+            ),
+            priority=feature.priority,
+        )
+
+
+@dataclass
+class KnowledgeIndex:
+    entries: List[Dict]
+    tag_matcher: KeywordMatcher
+    tag_entries: Dict[str, List[int]]
+    untagged_matches: List[int]
+
+
+class _JsonObjectScanner:
+    """Find where the first top-level JSON object of a streamed text ends"""
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+        self.complete = False
+
+    def feed(self, text: str) -> int:
+        """Return the index just past the closing brace in text, or -1"""
+        for index, char in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == "{":
+                self.depth += 1
+                self.started = True
+            elif not self.started:
+                continue
+            elif char == '"':
+                self.in_string = True
+            elif char == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.complete = True
+                    return index + 1
+        return -1
+
+
 class TestCaseGenerator:
     def __init__(self):
-        # Initialize OpenAI client (optional)
+        # Test case types for systematic generation
+        self.test_types = TEST_TYPES
+
+        # System prompt for LLM test case generation
+        self.system_prompt = SYSTEM_PROMPT
+
+        # OpenAI client, built on first use by the client property
+        self._client = None
+        self._client_unavailable = False
+
+    @property
+    def client(self):
+        """OpenAI client (optional), created on first use
+
+        Generators that never call the LLM, or run without an API key, do
+        not pay for building the HTTP client. A failed initialization is not
+        remembered, so the next call retries once the error clears.
+        """
+        if self._client is None and not self._client_unavailable:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self):
+        """Build the OpenAI client, or return None when it cannot be used"""
         if settings.openai_api_key and OpenAI is not None:
             try:
                 # Try to initialize with proxy settings and timeout
@@ -42,8 +277,10 @@ class TestCaseGenerator:
                     if old_https_proxy:
                         del os.environ["HTTPS_PROXY"]
 
-                    self.client = OpenAI(
-                        api_key=settings.openai_api_key, timeout=8.0  # 8 second timeout
+                    client = OpenAI(
+                        api_key=settings.openai_api_key,
+                        timeout=8.0,  # 8 second timeout
+                        max_retries=settings.openai_max_retries,
                     )
 
                     # Restore proxy settings
@@ -52,63 +289,46 @@ class TestCaseGenerator:
                     if old_https_proxy:
                         os.environ["HTTPS_PROXY"] = old_https_proxy
                 else:
-                    self.client = OpenAI(
-                        api_key=settings.openai_api_key, timeout=8.0  # 8 second timeout
+                    client = OpenAI(
+                        api_key=settings.openai_api_key,
+                        timeout=8.0,  # 8 second timeout
+                        max_retries=settings.openai_max_retries,
                     )
 
                 logger.info("OpenAI client initialized successfully")
+                return client
             except Exception as e:
                 logger.error(f"Failed to initialize OpenAI client: {str(e)}")
-                self.client = None
+                return None
         else:
+            # Configuration does not change at runtime, so stop checking
+            self._client_unavailable = True
             logger.warning("OpenAI client not initialized (no API key or SDK not installed)")
-            self.client = None
-
-        # Test case types for systematic generation
-        self.test_types = [
-            "function",
-            "boundary",
-            "exception",
-            "performance",
-            "security",
-        ]
-
-        # System prompt for LLM test case generation
-        self.system_prompt = """你是一个专业的汽车座椅软件测试专家。你的任务是根据给定的功能需求生成高质量的测试用例。
-
-请严格按照以下JSON格式返回测试用例：
-{
-  "title": "测试用例标题",
-  "description": "测试用例描述",
-  "test_type": "测试类型(function/boundary/exception/performance/security)",
-  "preconditions": "前置条件",
-  "test_steps": "测试步骤",
-  "expected_result": "预期结果",
-  "priority": "优先级(high/medium/low)"
-}
-
-测试用例要求：
-1. 针对汽车座椅软件系统的特定功能
-2. 包含完整的测试步骤和预期结果
-3. 考虑安全性、性能、边界条件等多个方面
-4. 使用专业的测试术语和规范
-5. 符合汽车行业标准和安全要求
-
-请确保测试用例具有可执行性、完整性和准确性。"""
+            return None
 
     def generate_test_cases(
-        self, requirement: Requirement, db: Session, max_time_seconds: int = 8
+        self,
+        requirement: Requirement,
+        db: Session,
+        max_time_seconds: int = 8,
+        features: Optional[List[ParsedFeature]] = None,
     ) -> List[TestCaseInfo]:
-        """Generate test cases for a requirement using LLM with timeout"""
+        """Generate test cases for a requirement using LLM with timeout
+
+        Callers that already hold the parsed features (for example several
+        requirements loaded with joinedload(Requirement.parsed_features))
+        can pass them in to skip the feature query.
+        """
         start_time = time.time()
 
         try:
             # Get parsed features
-            features = (
-                db.query(ParsedFeature)
-                .filter(ParsedFeature.requirement_id == requirement.id)
-                .all()
-            )
+            if features is None:
+                features = (
+                    db.query(ParsedFeature)
+                    .filter(ParsedFeature.requirement_id == requirement.id)
+                    .all()
+                )
 
             if not features:
                 logger.warning(
@@ -116,7 +336,6 @@ class TestCaseGenerator:
                 )
                 return []
 
-            test_cases = []
             total_features = len(features)
 
             # Limit the number of features to process to avoid timeout
@@ -127,45 +346,19 @@ class TestCaseGenerator:
                 f"Processing {len(features_to_process)} out of {total_features} features"
             )
 
-            for i, feature in enumerate(features_to_process):
-                # Check if we're running out of time
-                elapsed_time = time.time() - start_time
-                if elapsed_time > max_time_seconds:
-                    logger.warning(f"Timeout reached, stopping after {i} features")
-                    break
-
-                logger.info(
-                    f"Processing feature {i+1}/{len(features_to_process)}: {feature.feature_name}"
-                )
+            # Build one job per feature covering all of its test types; jobs
+            # carry detached snapshots so workers never touch the Session
+            max_types = 2  # Generate at most 2 types per feature
+            snapshots = [
+                FeatureSnapshot.from_feature(feature) for feature in features_to_process
+            ]
+            jobs = [
+                (feature, self._determine_test_types(feature)[:max_types])
+                for feature in snapshots
+            ]
 
-                # Generate different types of test cases using LLM
-                test_case_types = self._determine_test_types(feature)
-
-                # Limit test case types to avoid timeout
-                max_types = 2  # Generate at most 2 types per feature
-                test_case_types = test_case_types[:max_types]
-
-                for test_type in test_case_types:
-                    # Check timeout again
-                    elapsed_time = time.time() - start_time
-                    if elapsed_time > max_time_seconds:
-                        logger.warning(f"Timeout reached during {test_type} generation")
-                        break
-
-                    try:
-                        test_case = self._generate_test_case_with_llm(
-                            feature, test_type
-                        )
-                        if test_case:
-                            test_cases.append(test_case)
-                            logger.info(
-                                f"Generated {test_type} test case for {feature.feature_name}"
-                            )
-                    except Exception as e:
-                        logger.error(
-                            f"Error generating {test_type} test case for feature {feature.id}: {str(e)}"
-                        )
-                        # Continue with next test case type
+            remaining_time = max_time_seconds - (time.time() - start_time)
+            test_cases = self._run_generation_jobs(jobs, remaining_time)
 
             # Save test cases to database
             self._save_test_cases_to_db(test_cases, requirement, db)
@@ -182,7 +375,65 @@ class TestCaseGenerator:
             )
             return []
 
-    def _determine_test_types(self, feature: ParsedFeature) -> List[str]:
+    def _run_generation_jobs(
+        self, jobs: List[Tuple[FeatureSnapshot, List[str]]], timeout: float
+    ) -> List[TestCaseInfo]:
+        """Generate the test cases of each (feature, test types) job, keeping job order"""
+        if not jobs:
+            return []
+
+        if not self.client:
+            # Template fallback is local and fast, run it in place
+            deadline = time.time() + timeout
+            results = []
+            for feature, test_types in jobs:
+                if time.time() > deadline:
+                    logger.warning(
+                        f"Timeout reached before generating {feature.feature_name}"
+                    )
+                    break
+                results.append(self._generate_feature_job(feature, test_types))
+            return [test_case for test_cases in results for test_case in test_cases]
+
+        # LLM calls are network bound, so issue them concurrently and wait
+        # for all of them at most until the time budget runs out
+        executor = ThreadPoolExecutor(
+            max_workers=min(len(jobs), MAX_CONCURRENT_LLM_CALLS)
+        )
+        futures = [
+            executor.submit(self._generate_feature_job, feature, test_types)
+            for feature, test_types in jobs
+        ]
+        done, not_done = wait(futures, timeout=max(timeout, 0))
+        for future in not_done:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+        if not_done:
+            logger.warning(
+                f"Timeout reached, skipped {len(not_done)} of {len(jobs)} features"
+            )
+
+        results = [future.result() for future in futures if future in done]
+        return [test_case for test_cases in results for test_case in test_cases]
+
+    def _generate_feature_job(
+        self, feature: FeatureSnapshot, test_types: List[str]
+    ) -> List[TestCaseInfo]:
+        """Generate the test cases of one feature, logging instead of raising on errors"""
+        try:
+            test_cases = self._generate_test_cases_batch(feature, test_types)
+            logger.info(
+                f"Generated {len(test_cases)} test cases for {feature.feature_name}"
+            )
+            return test_cases
+        except Exception as e:
+            logger.error(
+                f"Error generating test cases for feature {feature.id}: {str(e)}"
+            )
+            return []
+
+    def _determine_test_types(self, feature: FeatureSnapshot) -> List[str]:
         """Determine what types of test cases to generate for a feature"""
         test_types = ["function"]  # Always include function test
 
@@ -208,77 +459,140 @@ class TestCaseGenerator:
         return test_types
 
     def _generate_test_case_with_llm(
-        self, feature: ParsedFeature, test_type: str
+        self, feature: FeatureSnapshot, test_type: str
     ) -> Optional[TestCaseInfo]:
         """Generate a single test case using LLM"""
+        test_cases = self._generate_test_cases_batch(feature, [test_type])
+        return test_cases[0] if test_cases else None
+
+    def _generate_test_cases_batch(
+        self, feature: FeatureSnapshot, test_types: List[str]
+    ) -> List[TestCaseInfo]:
+        """Generate one test case per test type for a feature with a single LLM call"""
         try:
-            # Create user prompt
-            user_prompt = f"""
-根据以下功能需求信息生成一个{test_type}类型的测试用例：
+            # Create user prompt: the fixed instructions come first and the
+            # feature-specific fields last, so every request shares the same
+            # prefix with the system prompt for provider-side prompt caching
+            user_prompt = f"""{USER_PROMPT_INSTRUCTIONS}
 
 功能名称：{feature.feature_name}
 功能类型：{feature.feature_type}
 功能描述：{feature.description}
-功能参数：{json.dumps(feature.parameters or {}, ensure_ascii=False)}
+功能参数：{_json_dumps(feature.parameters or {})}
 功能优先级：{feature.priority}
-
-请生成一个详细的{test_type}测试用例，确保测试用例符合汽车座椅软件系统的专业要求。
+测试类型：{"、".join(test_types)}
 """
 
             # Call OpenAI API
-            response = self._call_openai_api(user_prompt)
+            response = self._call_openai_api(
+                user_prompt, max_tokens=LLM_MAX_TOKENS_PER_CASE * len(test_types)
+            )
             if not response:
                 logger.warning(
-                    f"Failed to generate test case for feature {feature.id}, using fallback"
+                    f"Failed to generate test cases for feature {feature.id}, using fallback"
                 )
                 # Use fallback method when OpenAI is not available
-                return self._generate_fallback_test_case(feature, test_type)
+                return self._generate_fallback_test_cases(feature, test_types)
 
             # Parse the response
-            test_case_data = self._parse_llm_response(response)
-            if not test_case_data:
+            cases_data = self._parse_llm_cases(response)
+            if not cases_data:
                 logger.warning(
                     f"Failed to parse LLM response for feature {feature.id}, using fallback"
                 )
-                return self._generate_fallback_test_case(feature, test_type)
+                return self._generate_fallback_test_cases(feature, test_types)
+
+            # Pair each requested type with the case labelled with it; types
+            # that were not echoed back take a still unclaimed case, preferring
+            # the one at the same position, so no case is used twice
+            assigned = {}
+            for index, test_case_data in enumerate(cases_data):
+                test_type = test_case_data.get("test_type")
+                if test_type in test_types and test_type not in assigned:
+                    assigned[test_type] = index
+            claimed = set(assigned.values())
+            unclaimed = [
+                index for index in range(len(cases_data)) if index not in claimed
+            ]
+            for position, test_type in enumerate(test_types):
+                if test_type in assigned or not unclaimed:
+                    continue
+                index = position if position in unclaimed else unclaimed[0]
+                unclaimed.remove(index)
+                assigned[test_type] = index
 
-            # Create TestCaseInfo object
-            return TestCaseInfo(
-                title=test_case_data.get(
-                    "title", f"{feature.feature_name}{test_type}测试"
-                ),
-                description=test_case_data.get("description", ""),
-                test_type=test_case_data.get("test_type", test_type),
-                preconditions=test_case_data.get("preconditions", ""),
-                test_steps=test_case_data.get("test_steps", ""),
-                expected_result=test_case_data.get("expected_result", ""),
-                priority=test_case_data.get("priority", feature.priority),
-            )
+            test_cases = []
+            for test_type in test_types:
+                if test_type not in assigned:
+                    test_case = self._generate_fallback_test_case(feature, test_type)
+                else:
+                    test_case = self._build_test_case_info(
+                        cases_data[assigned[test_type]], feature, test_type
+                    )
+                if test_case:
+                    test_cases.append(test_case)
+
+            return test_cases
 
         except Exception as e:
             logger.error(
-                f"Error generating test case with LLM for feature {feature.id}: {str(e)}"
+                f"Error generating test cases with LLM for feature {feature.id}: {str(e)}"
             )
-            return None
+            return []
 
-    def _call_openai_api(self, user_prompt: str) -> Optional[str]:
+    def _build_test_case_info(
+        self, test_case_data: Dict[str, Any], feature: FeatureSnapshot, test_type: str
+    ) -> TestCaseInfo:
+        """Create a TestCaseInfo from a parsed LLM test case"""
+        return TestCaseInfo(
+            title=test_case_data.get("title", f"{feature.feature_name}{test_type}测试"),
+            description=test_case_data.get("description", ""),
+            test_type=test_type,
+            preconditions=test_case_data.get("preconditions", ""),
+            test_steps=test_case_data.get("test_steps", ""),
+            expected_result=test_case_data.get("expected_result", ""),
+            priority=test_case_data.get("priority", feature.priority),
+        )
+
+    def _call_openai_api(
+        self, user_prompt: str, max_tokens: int = LLM_MAX_TOKENS_PER_CASE
+    ) -> Optional[str]:
         """Call OpenAI API to generate test case"""
         try:
             if not self.client:
                 logger.warning("OpenAI client not initialized")
                 return None
 
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+            cache_key = None
+            if LLM_CACHE_ENABLED:
+                cache_key = make_cache_key(
+                    LLM_MODEL, self.system_prompt, user_prompt, LLM_TEMPERATURE
+                )
+                cached = _llm_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+            # Retries with exponential backoff for rate limits, timeouts and
+            # server errors are done by the client (see openai_max_retries)
+            _llm_rate_limiter.acquire()
+            stream = self.client.chat.completions.create(
+                model=LLM_MODEL,
                 messages=[
                     {"role": "system", "content": self.system_prompt},
                     {"role": "user", "content": user_prompt},
                 ],
-                max_tokens=1000,
-                temperature=0.7,
+                max_tokens=max_tokens,
+                temperature=LLM_TEMPERATURE,
+                response_format={"type": "json_object"},
+                stream=True,
             )
 
-            return response.choices[0].message.content.strip()
+            content, complete = self._read_json_from_stream(stream)
+            # Truncated or unparseable completions are returned (and fall back
+            # to templates) but never cached, so the next call retries the LLM
+            if cache_key is not None and complete and _is_json(content):
+                _llm_cache.set(cache_key, content)
+            return content
 
         except Exception as e:
             error_msg = str(e)
@@ -296,16 +610,48 @@ class TestCaseGenerator:
                 logger.error(f"OpenAI API error: {error_msg}")
             return None
 
+    def _read_json_from_stream(self, stream) -> Tuple[str, bool]:
+        """Collect streamed content, stopping once the first JSON object is closed
+
+        Also returns whether that object was closed before the stream ended.
+        """
+        scanner = _JsonObjectScanner()
+        parts = []
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+
+                end = scanner.feed(delta)
+                if end != -1:
+                    # Anything after the object is not needed
+                    parts.append(delta[:end])
+                    break
+                parts.append(delta)
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+
+        return "".join(parts).strip(), scanner.complete
+
     def _parse_llm_response(self, response: str) -> Optional[Dict[str, Any]]:
         """Parse LLM response to extract test case data"""
         try:
+            # JSON mode answers with the bare object, which needs no searching
+            if response.startswith("{") and response.endswith("}"):
+                return _json_loads(response)
+
             # Try to find JSON in the response
             start_idx = response.find("{")
             end_idx = response.rfind("}")
 
             if start_idx != -1 and end_idx != -1:
                 json_str = response[start_idx : end_idx + 1]
-                test_case_data = json.loads(json_str)
+                test_case_data = _json_loads(json_str)
                 return test_case_data
             else:
                 logger.warning("No JSON found in LLM response")
@@ -318,59 +664,42 @@ class TestCaseGenerator:
             logger.error(f"Error parsing LLM response: {str(e)}")
             return None
 
+    def _parse_llm_cases(self, response: str) -> List[Dict[str, Any]]:
+        """Parse an LLM response holding {"cases": [...]} or a single test case"""
+        test_case_data = self._parse_llm_response(response)
+        if not test_case_data:
+            return []
+
+        cases = test_case_data.get("cases")
+        if isinstance(cases, list):
+            return [case for case in cases if isinstance(case, dict)]
+        return [test_case_data]
+
+    def _generate_fallback_test_cases(
+        self, feature: FeatureSnapshot, test_types: List[str]
+    ) -> List[TestCaseInfo]:
+        """Generate fallback test cases for several test types"""
+        test_cases = [
+            self._generate_fallback_test_case(feature, test_type)
+            for test_type in test_types
+        ]
+        return [test_case for test_case in test_cases if test_case]
+
     def _generate_fallback_test_case(
-        self, feature: ParsedFeature, test_type: str
+        self, feature: FeatureSnapshot, test_type: str
     ) -> Optional[TestCaseInfo]:
         """Generate a fallback test case when LLM is not available"""
         try:
-            # Create a basic test case structure
-            test_type_mapping = {
-                "function": {
-                    "title": f"{feature.feature_name}功能测试",
-                    "description": f"验证{feature.feature_name}的基本功能",
-                    "preconditions": "1. 系统正常启动\n2. 座椅处于默认位置\n3. 电源正常供应",
-                    "test_steps": f"1. 启动{feature.feature_name}功能\n2. 执行基本操作\n3. 观察系统响应\n4. 验证功能正常",
-                    "expected_result": f"{feature.feature_name}功能正常工作，系统响应符合预期",
-                },
-                "boundary": {
-                    "title": f"{feature.feature_name}边界测试",
-                    "description": f"验证{feature.feature_name}在边界条件下的行为",
-                    "preconditions": "1. 系统正常启动\n2. 座椅处于默认位置\n3. 电源正常供应",
-                    "test_steps": f"1. 设置参数为最大值\n2. 执行{feature.feature_name}操作\n3. 设置参数为最小值\n4. 再次执行操作",
-                    "expected_result": "系统在边界值下正常工作，不出现异常",
-                },
-                "exception": {
-                    "title": f"{feature.feature_name}异常测试",
-                    "description": f"验证{feature.feature_name}的异常处理能力",
-                    "preconditions": "1. 系统正常启动\n2. 座椅处于默认位置",
-                    "test_steps": f"1. 创建异常条件\n2. 执行{feature.feature_name}操作\n3. 观察系统响应\n4. 验证错误处理",
-                    "expected_result": "系统能够正确处理异常情况，给出适当提示",
-                },
-                "performance": {
-                    "title": f"{feature.feature_name}性能测试",
-                    "description": f"验证{feature.feature_name}的性能指标",
-                    "preconditions": "1. 系统正常启动\n2. 座椅处于默认位置\n3. 性能监控工具准备",
-                    "test_steps": f"1. 启动性能监控\n2. 执行{feature.feature_name}操作\n3. 记录响应时间\n4. 分析性能数据",
-                    "expected_result": "响应时间在2秒内，性能指标符合要求",
-                },
-                "security": {
-                    "title": f"{feature.feature_name}安全测试",
-                    "description": f"验证{feature.feature_name}的安全保护机制",
-                    "preconditions": "1. 系统正常启动\n2. 座椅处于默认位置\n3. 安全测试环境准备",
-                    "test_steps": f"1. 在安全条件下执行{feature.feature_name}\n2. 观察安全机制响应\n3. 验证保护措施\n4. 检查安全日志",
-                    "expected_result": "安全保护机制正常工作，有效防护风险",
-                },
-            }
-
-            template = test_type_mapping.get(test_type, test_type_mapping["function"])
+            template = FALLBACK_TEMPLATES.get(test_type, FALLBACK_TEMPLATES["function"])
+            name = feature.feature_name
 
             return TestCaseInfo(
-                title=template["title"],
-                description=template["description"],
+                title=template["title"].format(name=name),
+                description=template["description"].format(name=name),
                 test_type=test_type,
                 preconditions=template["preconditions"],
-                test_steps=template["test_steps"],
-                expected_result=template["expected_result"],
+                test_steps=template["test_steps"].format(name=name),
+                expected_result=template["expected_result"].format(name=name),
                 priority=feature.priority,
             )
 
@@ -378,7 +707,7 @@ class TestCaseGenerator:
             logger.error(f"Error generating fallback test case: {str(e)}")
             return None
 
-    def _determine_test_priority(self, feature: ParsedFeature, test_type: str) -> str:
+    def _determine_test_priority(self, feature: FeatureSnapshot, test_type: str) -> str:
         """Determine test case priority"""
         # Safety tests are always high priority
         if test_type == "security":
@@ -400,21 +729,25 @@ class TestCaseGenerator:
     ):
         """Save generated test cases to database"""
         try:
-            for test_case in test_cases:
-                db_test_case = TestCase(
-                    requirement_id=requirement.id,
-                    user_id=requirement.user_id,
-                    title=test_case.title,
-                    description=test_case.description,
-                    test_type=test_case.test_type,
-                    preconditions=test_case.preconditions,
-                    test_steps=test_case.test_steps,
-                    expected_result=test_case.expected_result,
-                    priority=test_case.priority,
-                    generated_by="ai",
-                )
-                db.add(db_test_case)
-
+            # Insert all rows at once instead of one ORM object per test case
+            db.bulk_insert_mappings(
+                TestCase,
+                [
+                    {
+                        "requirement_id": requirement.id,
+                        "user_id": requirement.user_id,
+                        "title": test_case.title,
+                        "description": test_case.description,
+                        "test_type": test_case.test_type,
+                        "preconditions": test_case.preconditions,
+                        "test_steps": test_case.test_steps,
+                        "expected_result": test_case.expected_result,
+                        "priority": test_case.priority,
+                        "generated_by": "ai",
+                    }
+                    for test_case in test_cases
+                ],
+            )
             db.commit()
             logger.info(
                 f"Saved {len(test_cases)} test cases for requirement {requirement.id}"
@@ -424,17 +757,55 @@ class TestCaseGenerator:
             logger.error(f"Error saving test cases to database: {str(e)}")
             db.rollback()
 
+    def build_knowledge_index(self, knowledge_base: List[Dict]) -> KnowledgeIndex:
+        """Index knowledge base entries by tag for enhance_test_case"""
+        tag_entries: Dict[str, List[int]] = {}
+        untagged_matches = []
+        for index, kb in enumerate(knowledge_base):
+            for tag in kb.get("tags", []):
+                if not tag:
+                    # An empty tag is contained in every description
+                    untagged_matches.append(index)
+                    continue
+                entries = tag_entries.setdefault(tag, [])
+                if not entries or entries[-1] != index:
+                    entries.append(index)
+
+        return KnowledgeIndex(
+            entries=knowledge_base,
+            tag_matcher=KeywordMatcher(tag_entries),
+            tag_entries=tag_entries,
+            untagged_matches=untagged_matches,
+        )
+
+    def _find_relevant_knowledge(
+        self, description: str, knowledge_index: KnowledgeIndex
+    ) -> List[Dict]:
+        """Return the entries with a tag contained in description, in knowledge base order"""
+        matched = set(knowledge_index.untagged_matches)
+        for tag in knowledge_index.tag_matcher.find(description):
+            matched.update(knowledge_index.tag_entries[tag])
+        return [knowledge_index.entries[index] for index in sorted(matched)]
+
     def enhance_test_case(
-        self, test_case: TestCase, knowledge_base: List[Dict]
+        self,
+        test_case: TestCase,
+        knowledge_base: List[Dict],
+        knowledge_index: Optional[KnowledgeIndex] = None,
     ) -> TestCaseInfo:
-        """Enhance a test case with knowledge base information"""
+        """Enhance a test case with knowledge base information
+
+        Pass the result of build_knowledge_index(knowledge_base) when
+        enhancing several test cases with the same knowledge base.
+        """
         try:
-            # Find relevant knowledge
-            relevant_knowledge = [
-                kb
-                for kb in knowledge_base
-                if any(tag in test_case.description for tag in kb.get("tags", []))
-            ]
+            if knowledge_index is None:
+                knowledge_index = self.build_knowledge_index(knowledge_base)
+
+            # Find relevant knowledge with a single scan of the description
+            relevant_knowledge = self._find_relevant_knowledge(
+                test_case.description, knowledge_index
+            )
 
             enhanced_steps = test_case.test_steps
             enhanced_expected = test_case.expected_result
@@ -467,3 +838,9 @@ class TestCaseGenerator:
                 expected_result=test_case.expected_result,
                 priority=test_case.priority,
             )
+
+
+@lru_cache(maxsize=1)
+def get_test_case_generator() -> TestCaseGenerator:
+    """Return the process-wide generator, so its OpenAI client and connections are reused"""
+    return TestCaseGenerator()
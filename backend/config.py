@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 import os
 
@@ -5,6 +6,9 @@ import os
 class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///./test.db"
+    db_pool_size: int = 25
+    db_max_overflow: int = 25
+    db_pool_recycle: int = 1800  # seconds
     
     # Redis
     redis_url: str = "redis://localhost:6379"
@@ -24,6 +28,14 @@ class Settings(BaseSettings):
     # OpenAI (for development)
     openai_api_key: str = ""
     use_proxy: bool = True
+    openai_max_retries: int = 2  # retried with backoff on rate limits, timeouts and 5xx
+    openai_requests_per_minute: int = 0  # 0 disables client-side throttling
+    llm_temperature: float = 0.7  # 0 makes generation deterministic and cacheable
+    
+    # LLM response cache (set a Redis URL to share it across processes)
+    llm_cache_size: int = 1024
+    llm_cache_ttl: int = 3600  # seconds
+    llm_cache_redis_url: str = ""
     
     # Model settings
     ai_model_cache_dir: str = "models"
@@ -42,8 +54,21 @@ class Settings(BaseSettings):
     }
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, reading the environment and .env once"""
+    return Settings()
+
+
+settings = get_settings()
+
+
+def _ensure_dir(path: str):
+    """Create path unless it already exists (a single stat in the common case)"""
+    if not os.path.isdir(path):
+        os.makedirs(path, exist_ok=True)
+
 
 # Create directories if they don't exist
-os.makedirs(settings.upload_dir, exist_ok=True)
-os.makedirs(settings.ai_model_cache_dir, exist_ok=True)
\ No newline at end of file
+_ensure_dir(settings.upload_dir)
+_ensure_dir(settings.ai_model_cache_dir)
\ No newline at end of file
@@ -11,14 +11,12 @@ from .routers import auth, requirements, test_cases, templates, knowledge, gener
 from .routers import analytics
 
 
-# Create tables
-Base.metadata.create_all(bind=engine)
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("Starting up...")
+    # Create tables once per app process rather than on import
+    Base.metadata.create_all(bind=engine)
     yield
     # Shutdown
     print("Shutting down...")
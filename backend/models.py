@@ -1,14 +1,25 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON, Index, DDL, event, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, declarative_base, deferred
 from datetime import datetime
 
 Base = declarative_base()
 
+# Stored as binary JSONB on PostgreSQL so reads skip re-parsing the text
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+# The knowledge base search indexes use trigram operator classes
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
 
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     username = Column(String(50), unique=True, index=True, nullable=False)
     email = Column(String(100), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
@@ -33,8 +44,11 @@ class User(Base):
 
 class Requirement(Base):
     __tablename__ = "requirements"
+    __table_args__ = (
+        Index("ix_req_user_status", "user_id", "status"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=False)
     content = Column(Text, nullable=False)
@@ -64,14 +78,14 @@ class Requirement(Base):
 class ParsedFeature(Base):
     __tablename__ = "parsed_features"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     requirement_id = Column(Integer, ForeignKey("requirements.id"))
     feature_name = Column(String(200), nullable=False)
     feature_type = Column(String(50))  # function, performance, security, etc.
     description = Column(Text)
-    parameters = Column(JSON)
-    constraints = Column(JSON)
-    dependencies = Column(JSON)
+    parameters = Column(JSONType)
+    constraints = Column(JSONType)
+    dependencies = Column(JSONType)
     priority = Column(String(20), default="medium")  # high, medium, low
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -81,8 +95,13 @@ class ParsedFeature(Base):
 
 class TestCase(Base):
     __tablename__ = "test_cases"
+    __table_args__ = (
+        Index("ix_testcase_user_type", "user_id", "test_type"),
+        Index("ix_testcase_user_priority", "user_id", "priority"),
+        Index("ix_testcase_req_user", "requirement_id", "user_id"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     requirement_id = Column(Integer, ForeignKey("requirements.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
     title = Column(String(200), nullable=False)
@@ -112,7 +131,7 @@ class TestCase(Base):
 class TestCaseEvaluation(Base):
     __tablename__ = "test_case_evaluations"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     test_case_id = Column(Integer, ForeignKey("test_cases.id"))
     
     # Quality scores (0-100)
@@ -124,8 +143,8 @@ class TestCaseEvaluation(Base):
     total_score = Column(Float, default=0)
     
     # Detailed evaluation
-    evaluation_details = Column(JSON)
-    suggestions = Column(JSON)
+    evaluation_details = Column(JSONType)
+    suggestions = Column(JSONType)
     evaluator_type = Column(String(50), default="ai")  # ai, human, hybrid
     evaluated_at = Column(DateTime, default=datetime.utcnow)
     
@@ -136,12 +155,12 @@ class TestCaseEvaluation(Base):
 class TestTemplate(Base):
     __tablename__ = "test_templates"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
     category = Column(String(50))  # function, boundary, exception, performance, security
     description = Column(Text)
     template_content = Column(Text, nullable=False)
-    variables = Column(JSON)
+    variables = Column(JSONType)
     usage_count = Column(Integer, default=0)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -150,13 +169,37 @@ class TestTemplate(Base):
 
 class KnowledgeBase(Base):
     __tablename__ = "knowledge_base"
+    __table_args__ = (
+        # Trigram indexes let PostgreSQL answer the LIKE '%term%' searches without a
+        # full scan; they also work for Chinese text, which to_tsvector cannot split
+        Index(
+            "ix_kb_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_kb_content_trgm",
+            "content",
+            postgresql_using="gin",
+            postgresql_ops={"content": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Category filters and the category/subcategory lists only ever read active rows
+        Index(
+            "ix_kb_active_category",
+            "category",
+            "subcategory",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     category = Column(String(100), nullable=False)  # seat_functions, test_standards, failure_modes
     subcategory = Column(String(100))
     title = Column(String(200), nullable=False)
     content = Column(Text, nullable=False)
-    tags = Column(JSON)
+    tags = Column(JSONType)
     source = Column(String(200))
     confidence = Column(Float, default=1.0)
     usage_count = Column(Integer, default=0)
@@ -167,13 +210,24 @@ class KnowledgeBase(Base):
 
 class GenerationLog(Base):
     __tablename__ = "generation_logs"
+    __table_args__ = (
+        Index("ix_genlog_user_type_created", "user_id", "generation_type", "created_at"),
+        # History pages and the latest-log lookup read straight from this index on PostgreSQL
+        Index(
+            "ix_genlog_user_created",
+            "user_id",
+            "created_at",
+            postgresql_include=["generation_type", "status", "processing_time", "requirement_id"],
+        ),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     requirement_id = Column(Integer, ForeignKey("requirements.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
     generation_type = Column(String(50))  # requirement_parsing, test_generation, quality_evaluation
-    input_data = Column(JSON)
-    output_data = Column(JSON)
+    # Large payloads, loaded only when accessed
+    input_data = deferred(Column(JSONType))
+    output_data = deferred(Column(JSONType))
     model_used = Column(String(100))
     processing_time = Column(Float)  # seconds
     tokens_used = Column(Integer)
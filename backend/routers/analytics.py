@@ -1,83 +1,108 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy import func, literal
 from sqlalchemy.orm import Session
 from typing import Dict, Any
 
 from ..database import get_db
 from ..models import Requirement, TestCase, ParsedFeature, TestCaseEvaluation, User
 from ..routers.auth import get_current_active_user
+from ..ttl_cache import TTLCache
 
 
 router = APIRouter()
 
+# Dashboards poll these endpoints, so repeat calls are answered from memory for a
+# short while; write paths call invalidate_user_analytics to drop stale entries
+ANALYTICS_CACHE_TTL_SECONDS = 15
+ANALYTICS_CACHE_MAX_ENTRIES = 10_000
+_analytics_cache = TTLCache(ANALYTICS_CACHE_TTL_SECONDS, ANALYTICS_CACHE_MAX_ENTRIES)
+
+
+def invalidate_user_analytics(user_id: int):
+    """Drop the cached analytics of a user whose data just changed"""
+    _analytics_cache.pop((user_id, "overview"))
+    _analytics_cache.pop((user_id, "breakdown"))
+
 
 @router.get("/overview", response_model=Dict[str, Any])
-async def get_overview(
+def get_overview(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
+    cached = _analytics_cache.get((current_user.id, "overview"))
+    if cached is not None:
+        return cached
+
+    # All four figures come back from a single round trip
     requirements_count = (
-        db.query(Requirement).filter(Requirement.user_id == current_user.id).count()
+        db.query(func.count(Requirement.id))
+        .filter(Requirement.user_id == current_user.id)
+        .scalar_subquery()
     )
     test_cases_count = (
-        db.query(TestCase).filter(TestCase.user_id == current_user.id).count()
+        db.query(func.count(TestCase.id))
+        .filter(TestCase.user_id == current_user.id)
+        .scalar_subquery()
     )
     features_count = (
-        db.query(ParsedFeature)
+        db.query(func.count(ParsedFeature.id))
         .join(Requirement, ParsedFeature.requirement_id == Requirement.id)
         .filter(Requirement.user_id == current_user.id)
-        .count()
+        .scalar_subquery()
     )
     # Average score from all evaluations for this user (simplified)
-    evaluations = (
-        db.query(TestCaseEvaluation.total_score)
+    avg_score = (
+        db.query(func.coalesce(func.avg(TestCaseEvaluation.total_score), 0))
         .join(TestCase, TestCaseEvaluation.test_case_id == TestCase.id)
         .filter(TestCase.user_id == current_user.id)
-        .all()
-    )
-    avg_score = (
-        sum(e.total_score for e in evaluations) / len(evaluations) if evaluations else 0
+        .scalar_subquery()
     )
-    return {
+    requirements_count, test_cases_count, features_count, avg_score = db.query(
+        requirements_count, test_cases_count, features_count, avg_score
+    ).one()
+    overview = {
         "requirements_count": requirements_count,
         "test_cases_count": test_cases_count,
         "features_count": features_count,
         "average_score": avg_score,
     }
+    _analytics_cache.set((current_user.id, "overview"), overview)
+    return overview
 
 
 @router.get("/breakdown", response_model=Dict[str, Any])
-async def get_breakdown(
+def get_breakdown(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
-    from sqlalchemy import func
+    cached = _analytics_cache.get((current_user.id, "breakdown"))
+    if cached is not None:
+        return cached
 
+    # One round trip: (kind, bucket, count) rows for all three pivots
     status_rows = (
-        db.query(Requirement.status, func.count(Requirement.id))
+        db.query(literal("requirement_status"), Requirement.status, func.count(Requirement.id))
         .filter(Requirement.user_id == current_user.id)
         .group_by(Requirement.status)
-        .all()
     )
-    requirement_status = {status: count for status, count in status_rows}
-
     priority_rows = (
-        db.query(TestCase.priority, func.count(TestCase.id))
+        db.query(literal("test_case_priority"), TestCase.priority, func.count(TestCase.id))
         .filter(TestCase.user_id == current_user.id)
         .group_by(TestCase.priority)
-        .all()
     )
-    test_case_priority = {priority: count for priority, count in priority_rows}
-
     type_rows = (
-        db.query(TestCase.test_type, func.count(TestCase.id))
+        db.query(literal("test_type"), TestCase.test_type, func.count(TestCase.id))
         .filter(TestCase.user_id == current_user.id)
         .group_by(TestCase.test_type)
-        .all()
     )
-    test_type = {name: count for name, count in type_rows}
 
-    return {
-        "requirement_status": requirement_status,
-        "test_case_priority": test_case_priority,
-        "test_type": test_type,
+    breakdown: Dict[str, Dict[Any, int]] = {
+        "requirement_status": {},
+        "test_case_priority": {},
+        "test_type": {},
     }
+    for kind, bucket, count in status_rows.union_all(priority_rows, type_rows).all():
+        breakdown[kind][bucket] = count
+
+    _analytics_cache.set((current_user.id, "breakdown"), breakdown)
+    return breakdown
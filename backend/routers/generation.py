@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import uuid
 import logging
+from statistics import fmean
 from datetime import datetime
 
 from ..database import get_db
@@ -11,6 +13,7 @@ from ..schemas import (
     GenerationRequest, GenerationResponse, APIResponse
 )
 from ..routers.auth import get_current_active_user
+from ..routers.analytics import invalidate_user_analytics
 
 router = APIRouter()
 _TASK_STATUS: dict[str, dict] = {}
@@ -18,7 +21,7 @@ logger = logging.getLogger(__name__)
 
 
 @router.post("/test-cases", response_model=GenerationResponse)
-async def generate_test_cases(
+def generate_test_cases(
     request: GenerationRequest,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -47,15 +50,15 @@ async def generate_test_cases(
     
     try:
         # Import test case generator
-        from ..ai.test_case_generator import TestCaseGenerator
+        from ..ai.test_case_generator import get_test_case_generator
         
-        # Initialize generator and generate test cases
-        generator = TestCaseGenerator()
+        # Reuse the shared generator and generate test cases
+        generator = get_test_case_generator()
         test_cases = generator.generate_test_cases(requirement, db)
         
         # Update log with success
         log.status = "completed"
-        log.output_data = {
+        output_data = {
             "test_cases_count": len(test_cases),
             "test_cases": [
                 {
@@ -65,11 +68,13 @@ async def generate_test_cases(
                 } for tc in test_cases
             ]
         }
+        log.output_data = output_data
         db.commit()
+        invalidate_user_analytics(current_user.id)
         _TASK_STATUS[task_id] = {
             "status": "completed",
             "log_id": log.id,
-            "output": log.output_data,
+            "output": output_data,
         }
         
         return GenerationResponse(
@@ -84,6 +89,7 @@ async def generate_test_cases(
         log.status = "failed"
         log.error_message = str(e)
         db.commit()
+        invalidate_user_analytics(current_user.id)
         
         logger.error(f"Error generating test cases for requirement {request.requirement_id}: {str(e)}")
         raise HTTPException(
@@ -93,7 +99,7 @@ async def generate_test_cases(
 
 
 @router.post("/evaluation", response_model=GenerationResponse)
-async def generate_evaluation(
+def generate_evaluation(
     request: GenerationRequest,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -125,42 +131,47 @@ async def generate_evaluation(
         from ..ai.quality_evaluator import QualityEvaluator
         
         # Get test cases for this requirement
-        test_cases = db.query(TestCase).filter(
-            TestCase.requirement_id == request.requirement_id,
-            TestCase.user_id == current_user.id
-        ).all()
+        test_case_ids = [
+            test_case_id
+            for (test_case_id,) in db.query(TestCase.id).filter(
+                TestCase.requirement_id == request.requirement_id,
+                TestCase.user_id == current_user.id
+            ).all()
+        ]
         
-        if not test_cases:
+        if not test_case_ids:
             raise HTTPException(status_code=404, detail="No test cases found for this requirement")
         
-        # Initialize evaluator and evaluate test cases
+        # Initialize evaluator and evaluate test cases, saving them with one commit
         evaluator = QualityEvaluator()
-        evaluation_results = []
-        
-        for test_case in test_cases:
-            result = evaluator.evaluate_test_case(test_case, db)
-            evaluation_results.append({
-                "test_case_id": test_case.id,
+        results = evaluator.batch_evaluate(test_case_ids, db)
+        evaluation_results = [
+            {
+                "test_case_id": test_case_id,
                 "total_score": result.total_score,
                 "completeness_score": result.completeness_score,
                 "accuracy_score": result.accuracy_score,
                 "executability_score": result.executability_score,
                 "coverage_score": result.coverage_score,
                 "clarity_score": result.clarity_score
-            })
+            }
+            for test_case_id, result in results.items()
+        ]
         
         # Update log with success
         log.status = "completed"
-        log.output_data = {
+        output_data = {
             "evaluated_count": len(evaluation_results),
-            "average_score": sum(r["total_score"] for r in evaluation_results) / len(evaluation_results),
+            "average_score": fmean(result.total_score for result in results.values()),
             "evaluations": evaluation_results
         }
+        log.output_data = output_data
         db.commit()
+        invalidate_user_analytics(current_user.id)
         _TASK_STATUS[task_id] = {
             "status": "completed",
             "log_id": log.id,
-            "output": log.output_data,
+            "output": output_data,
         }
         
         return GenerationResponse(
@@ -175,6 +186,7 @@ async def generate_evaluation(
         log.status = "failed"
         log.error_message = str(e)
         db.commit()
+        invalidate_user_analytics(current_user.id)
         
         logger.error(f"Error evaluating test cases for requirement {request.requirement_id}: {str(e)}")
         raise HTTPException(
@@ -184,7 +196,7 @@ async def generate_evaluation(
 
 
 @router.get("/status/{task_id}", response_model=APIResponse)
-async def get_generation_status(
+def get_generation_status(
     task_id: str,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -218,35 +230,57 @@ async def get_generation_status(
 
 
 @router.get("/history", response_model=List[dict])
-async def get_generation_history(
+def get_generation_history(
     generation_type: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    query = db.query(GenerationLog).filter(GenerationLog.user_id == current_user.id)
+    # Only the listed fields; the input/output JSON payloads are never fetched
+    query = select(
+        GenerationLog.id,
+        GenerationLog.requirement_id,
+        GenerationLog.generation_type,
+        GenerationLog.status,
+        GenerationLog.processing_time,
+        GenerationLog.created_at
+    ).where(GenerationLog.user_id == current_user.id)
     
     if generation_type:
-        query = query.filter(GenerationLog.generation_type == generation_type)
+        query = query.where(GenerationLog.generation_type == generation_type)
     
-    logs = query.order_by(GenerationLog.created_at.desc()).offset(skip).limit(limit).all()
+    query = query.order_by(GenerationLog.created_at.desc()).offset(skip).limit(limit)
     
-    return [
-        {
-            "id": log.id,
-            "requirement_id": log.requirement_id,
-            "generation_type": log.generation_type,
-            "status": log.status,
-            "processing_time": log.processing_time,
-            "created_at": log.created_at
-        }
-        for log in logs
-    ]
+    # Plain row mappings, with no ORM query or identity map in the way
+    return [dict(log) for log in db.execute(query).mappings()]
+
+
+def _build_history_log(history_data: dict, user_id: int) -> GenerationLog:
+    """Build a generation log row from a history record sent by the client"""
+    return GenerationLog(
+        requirement_id=history_data.get("requirement_id"),
+        user_id=user_id,
+        generation_type=history_data.get("generation_type", "test_cases"),
+        status=history_data.get("status", "completed"),
+        processing_time=history_data.get("processing_time", 0),
+        created_at=datetime.fromisoformat(history_data.get("created_at")) if history_data.get("created_at") else datetime.utcnow()
+    )
+
+
+def _history_record(log: GenerationLog) -> dict:
+    return {
+        "id": log.id,
+        "requirement_id": log.requirement_id,
+        "generation_type": log.generation_type,
+        "status": log.status,
+        "processing_time": log.processing_time,
+        "created_at": log.created_at
+    }
 
 
 @router.post("/history", response_model=dict)
-async def create_generation_history(
+def create_generation_history(
     history_data: dict,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -263,28 +297,51 @@ async def create_generation_history(
             raise HTTPException(status_code=404, detail="Requirement not found")
         
         # 创建生成日志
-        log = GenerationLog(
-            requirement_id=history_data.get("requirement_id"),
-            user_id=current_user.id,
-            generation_type=history_data.get("generation_type", "test_cases"),
-            status=history_data.get("status", "completed"),
-            processing_time=history_data.get("processing_time", 0),
-            created_at=datetime.fromisoformat(history_data.get("created_at")) if history_data.get("created_at") else datetime.utcnow()
-        )
+        log = _build_history_log(history_data, current_user.id)
         
         db.add(log)
+        # The INSERT returns the new id on flush, so no refresh SELECT is needed
+        db.flush()
+        record = _history_record(log)
         db.commit()
-        db.refresh(log)
+        invalidate_user_analytics(current_user.id)
         
-        return {
-            "id": log.id,
-            "requirement_id": log.requirement_id,
-            "generation_type": log.generation_type,
-            "status": log.status,
-            "processing_time": log.processing_time,
-            "created_at": log.created_at
-        }
+        return record
+        
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to create generation history: {str(e)}")
+
+
+@router.post("/history/bulk", response_model=List[dict])
+def create_generation_history_bulk(
+    history_items: List[dict],
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """批量创建生成历史记录（一次查询校验、一次提交）"""
+    requirement_ids = {item.get("requirement_id") for item in history_items}
+    owned_ids = {
+        requirement_id
+        for (requirement_id,) in db.query(Requirement.id).filter(
+            Requirement.id.in_(requirement_ids),
+            Requirement.user_id == current_user.id
+        ).all()
+    }
+    if requirement_ids - owned_ids:
+        raise HTTPException(status_code=404, detail="Requirement not found")
+    
+    try:
+        logs = [_build_history_log(item, current_user.id) for item in history_items]
+        db.add_all(logs)
+        # Flushing assigns the ids, so the response needs no refresh after commit
+        db.flush()
+        records = [_history_record(log) for log in logs]
+        db.commit()
+        invalidate_user_analytics(current_user.id)
+        
+        return records
         
     except Exception as e:
         db.rollback()
-        raise HTTPException(status_code=500, detail=f"Failed to create generation history: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to create generation history: {str(e)}")
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -9,26 +10,37 @@ from ..schemas import (
     APIResponse
 )
 from ..routers.auth import get_current_active_user
+from ..ttl_cache import TTLCache
 from ..models import User
 
 router = APIRouter()
 
+# Category lists back dropdowns and change only when knowledge is edited, so the
+# DISTINCT scans are cached briefly and dropped by every knowledge write
+CATEGORY_CACHE_TTL_SECONDS = 60
+CATEGORY_CACHE_MAX_ENTRIES = 1000
+_category_cache = TTLCache(CATEGORY_CACHE_TTL_SECONDS, CATEGORY_CACHE_MAX_ENTRIES)
+
 
 @router.post("/", response_model=KnowledgeBaseSchema)
-async def create_knowledge(
+def create_knowledge(
     knowledge: KnowledgeBaseCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     db_knowledge = KnowledgeBase(**knowledge.model_dump())
     db.add(db_knowledge)
+    # The INSERT returns the id on flush and the defaults are set in Python,
+    # so the response is built without a refresh SELECT
+    db.flush()
+    result = KnowledgeBaseSchema.model_validate(db_knowledge)
     db.commit()
-    db.refresh(db_knowledge)
-    return db_knowledge
+    _category_cache.clear()
+    return result
 
 
 @router.get("/", response_model=List[KnowledgeBaseSchema])
-async def read_knowledge(
+def read_knowledge(
     category: Optional[str] = None,
     subcategory: Optional[str] = None,
     search: Optional[str] = None,
@@ -44,6 +56,8 @@ async def read_knowledge(
     if subcategory:
         query = query.filter(KnowledgeBase.subcategory == subcategory)
     
+    # A blank search would only add a LIKE '%%' that every row matches
+    search = (search or "").strip()
     if search:
         query = query.filter(
             KnowledgeBase.title.contains(search) |
@@ -55,26 +69,35 @@ async def read_knowledge(
 
 
 @router.get("/{knowledge_id}", response_model=KnowledgeBaseSchema)
-async def read_knowledge_item(
+def read_knowledge_item(
     knowledge_id: int,
     db: Session = Depends(get_db)
 ):
-    knowledge = db.query(KnowledgeBase).filter(
+    # Increment usage count atomically in the database, getting the row back
+    # from the same UPDATE, so concurrent reads never lose an increment
+    statement = update(KnowledgeBase).where(
         KnowledgeBase.id == knowledge_id,
         KnowledgeBase.is_active == True
-    ).first()
+    ).values(usage_count=KnowledgeBase.usage_count + 1)
+    
+    if db.get_bind().dialect.update_returning:
+        knowledge = db.execute(statement.returning(KnowledgeBase)).scalar_one_or_none()
+    else:
+        updated = db.execute(statement, execution_options={"synchronize_session": False}).rowcount
+        knowledge = db.get(KnowledgeBase, knowledge_id, populate_existing=True) if updated else None
     if knowledge is None:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Knowledge item not found")
     
-    # Increment usage count
-    knowledge.usage_count += 1
+    # Serialize before commit, which would expire the row and force a reload
+    result = KnowledgeBaseSchema.model_validate(knowledge)
     db.commit()
     
-    return knowledge
+    return result
 
 
 @router.put("/{knowledge_id}", response_model=KnowledgeBaseSchema)
-async def update_knowledge(
+def update_knowledge(
     knowledge_id: int,
     knowledge: KnowledgeBaseCreate,
     current_user: User = Depends(get_current_active_user),
@@ -87,13 +110,15 @@ async def update_knowledge(
     for key, value in knowledge.model_dump().items():
         setattr(db_knowledge, key, value)
     
+    db.flush()
+    result = KnowledgeBaseSchema.model_validate(db_knowledge)
     db.commit()
-    db.refresh(db_knowledge)
-    return db_knowledge
+    _category_cache.clear()
+    return result
 
 
 @router.delete("/{knowledge_id}")
-async def delete_knowledge(
+def delete_knowledge(
     knowledge_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -104,32 +129,45 @@ async def delete_knowledge(
     
     knowledge.is_active = False
     db.commit()
+    _category_cache.clear()
     return {"message": "Knowledge item deleted successfully"}
 
 
 @router.get("/categories/list", response_model=List[str])
-async def get_knowledge_categories(db: Session = Depends(get_db)):
+def get_knowledge_categories(db: Session = Depends(get_db)):
+    cached = _category_cache.get(("categories",))
+    if cached is not None:
+        return cached
+    
     categories = db.query(KnowledgeBase.category).filter(
         KnowledgeBase.is_active == True
     ).distinct().all()
-    return [category[0] for category in categories]
+    categories = [category[0] for category in categories]
+    _category_cache.set(("categories",), categories)
+    return categories
 
 
 @router.get("/categories/{category}/subcategories", response_model=List[str])
-async def get_knowledge_subcategories(
+def get_knowledge_subcategories(
     category: str,
     db: Session = Depends(get_db)
 ):
+    cached = _category_cache.get(("subcategories", category))
+    if cached is not None:
+        return cached
+    
     subcategories = db.query(KnowledgeBase.subcategory).filter(
         KnowledgeBase.category == category,
         KnowledgeBase.is_active == True,
         KnowledgeBase.subcategory.isnot(None)
     ).distinct().all()
-    return [subcategory[0] for subcategory in subcategories]
+    subcategories = [subcategory[0] for subcategory in subcategories]
+    _category_cache.set(("subcategories", category), subcategories)
+    return subcategories
 
 
 @router.post("/search", response_model=List[KnowledgeBaseSchema])
-async def search_knowledge(
+def search_knowledge(
     query: str,
     category: Optional[str] = None,
     limit: int = 10,
@@ -143,11 +181,13 @@ async def search_knowledge(
     if category:
         search_query = search_query.filter(KnowledgeBase.category == category)
     
-    # Search in title and content
-    search_query = search_query.filter(
-        KnowledgeBase.title.contains(query) |
-        KnowledgeBase.content.contains(query)
-    )
+    # Search in title and content; a blank query matches everything anyway
+    query = query.strip()
+    if query:
+        search_query = search_query.filter(
+            KnowledgeBase.title.contains(query) |
+            KnowledgeBase.content.contains(query)
+        )
     
     results = search_query.limit(limit).all()
     return results
\ No newline at end of file
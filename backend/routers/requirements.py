@@ -13,6 +13,7 @@ from ..schemas import (
     ParsedFeature as ParsedFeatureSchema, APIResponse, FileUploadResponse
 )
 from ..routers.auth import get_current_active_user
+from ..routers.analytics import invalidate_user_analytics
 from ..config import settings
 
 router = APIRouter()
@@ -32,6 +33,7 @@ async def create_requirement(
     db.add(db_requirement)
     db.commit()
     db.refresh(db_requirement)
+    invalidate_user_analytics(current_user.id)
     return db_requirement
 
 
@@ -56,6 +58,7 @@ async def read_requirements(
         )
         db.add(seed_requirement)
         db.commit()
+        invalidate_user_analytics(current_user.id)
         db.refresh(seed_requirement)
         requirements = [seed_requirement]
     return requirements
@@ -95,6 +98,7 @@ async def update_requirement(
     
     db_requirement.updated_at = datetime.utcnow()
     db.commit()
+    invalidate_user_analytics(current_user.id)
     db.refresh(db_requirement)
     return db_requirement
 
@@ -114,6 +118,7 @@ async def delete_requirement(
     
     db.delete(requirement)
     db.commit()
+    invalidate_user_analytics(current_user.id)
     return {"message": "Requirement deleted successfully"}
 
 
@@ -215,6 +220,7 @@ async def parse_requirement(
         # Update requirement status
         requirement.status = "completed"
         db.commit()
+        invalidate_user_analytics(current_user.id)
         
         return APIResponse(
             success=True,
@@ -236,6 +242,7 @@ async def parse_requirement(
         # Update requirement status to failed
         requirement.status = "failed"
         db.commit()
+        invalidate_user_analytics(current_user.id)
         
         logger.error(f"Error parsing requirement {requirement_id}: {str(e)}")
         raise HTTPException(
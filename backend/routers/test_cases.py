@@ -12,6 +12,7 @@ from ..schemas import (
     APIResponse
 )
 from ..routers.auth import get_current_active_user
+from ..routers.analytics import invalidate_user_analytics
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -39,6 +40,7 @@ async def create_test_case(
     db.add(db_test_case)
     db.commit()
     db.refresh(db_test_case)
+    invalidate_user_analytics(current_user.id)
     return db_test_case
 
 
@@ -134,6 +136,7 @@ async def update_test_case(
     
     db_test_case.updated_at = datetime.utcnow()
     db.commit()
+    invalidate_user_analytics(current_user.id)
     db.refresh(db_test_case)
     return db_test_case
 
@@ -153,6 +156,7 @@ async def delete_test_case(
     
     db.delete(test_case)
     db.commit()
+    invalidate_user_analytics(current_user.id)
     return {"message": "Test case deleted successfully"}
 
 
@@ -200,6 +204,7 @@ async def evaluate_test_case(
         # Initialize evaluator and evaluate test case
         evaluator = QualityEvaluator()
         result = evaluator.evaluate_test_case(test_case, db)
+        invalidate_user_analytics(current_user.id)
         
         return APIResponse(
             success=True,
@@ -261,6 +266,7 @@ async def batch_evaluate_test_cases(
                 "coverage_score": result.coverage_score,
                 "clarity_score": result.clarity_score
             })
+        invalidate_user_analytics(current_user.id)
         
         return APIResponse(
             success=True,
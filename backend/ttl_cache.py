@@ -0,0 +1,47 @@
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Small thread-safe in-process cache whose entries expire after ttl seconds"""
+
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def set(self, key: Hashable, value: Any):
+        """Store value under key; when full, expired entries go first, then everything"""
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.maxsize:
+                expired = [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]
+                for k in expired:
+                    del self._entries[k]
+                if len(self._entries) >= self.maxsize:
+                    self._entries.clear()
+            self._entries[key] = (now + self.ttl, value)
+
+    def pop(self, key: Hashable):
+        """Drop a single entry if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -17,8 +17,9 @@ from backend.main import app
 
 @pytest.fixture
 def client():
-    """创建测试客户端"""
-    return TestClient(app)
+    """创建测试客户端（进入上下文以运行lifespan建表）"""
+    with TestClient(app) as client:
+        yield client
 
 @pytest.fixture
 def auth_headers(client):
@@ -246,6 +247,71 @@ def test_generation_history(client, auth_headers):
     history = response.json()
     assert isinstance(history, list)
 
+def test_bulk_generation_history(client, auth_headers, test_requirement_id):
+    """测试批量创建生成历史"""
+    history_items = [
+        {"requirement_id": test_requirement_id, "generation_type": "test_generation"},
+        {"requirement_id": test_requirement_id, "status": "failed", "created_at": "2024-01-01T00:00:00"},
+    ]
+    response = client.post("/api/v1/generation/history/bulk", json=history_items, headers=auth_headers)
+    assert response.status_code == 200, f"批量创建历史失败: {response.text}"
+    records = response.json()
+    assert len(records) == 2
+    assert all(record["id"] for record in records), "每条记录都应返回ID"
+    assert records[1]["status"] == "failed"
+
+    # 不属于当前用户的需求应整体拒绝
+    response = client.post("/api/v1/generation/history/bulk", json=[{"requirement_id": -1}], headers=auth_headers)
+    assert response.status_code == 404
+
+def test_analytics_overview_refreshes_after_write(client, auth_headers):
+    """测试分析概览缓存在数据变更后失效"""
+    response = client.get("/api/v1/analytics/overview", headers=auth_headers)
+    assert response.status_code == 200, f"获取概览失败: {response.text}"
+    before = response.json()["requirements_count"]
+
+    requirement_data = {
+        "title": "分析缓存测试需求",
+        "description": "验证概览缓存失效",
+        "content": "座椅加热功能需求。"
+    }
+    response = client.post("/api/v1/requirements/", json=requirement_data, headers=auth_headers)
+    assert response.status_code == 200
+    requirement_id = response.json()["id"]
+
+    response = client.get("/api/v1/analytics/overview", headers=auth_headers)
+    assert response.json()["requirements_count"] == before + 1, "新建需求后概览应立即更新"
+
+    # 更新需求状态后分布统计也应立即更新
+    response = client.get("/api/v1/analytics/breakdown", headers=auth_headers)
+    assert response.status_code == 200, f"获取分布统计失败: {response.text}"
+    failed_before = response.json()["requirement_status"].get("failed", 0)
+
+    response = client.put(f"/api/v1/requirements/{requirement_id}", json={"status": "failed"}, headers=auth_headers)
+    assert response.status_code == 200, f"更新需求失败: {response.text}"
+
+    response = client.get("/api/v1/analytics/breakdown", headers=auth_headers)
+    assert response.json()["requirement_status"].get("failed", 0) == failed_before + 1, "更新需求后分布统计应立即更新"
+
+def test_knowledge_categories_refresh_after_write(client, auth_headers):
+    """测试知识库分类缓存在新增和删除后失效"""
+    response = client.get("/api/v1/knowledge/categories/list")
+    assert response.status_code == 200, f"获取分类失败: {response.text}"
+
+    category = f"缓存测试_{datetime.now().strftime('%H%M%S%f')}"
+    knowledge_data = {"category": category, "title": "分类缓存测试", "content": "座椅加热知识"}
+    response = client.post("/api/v1/knowledge/", json=knowledge_data, headers=auth_headers)
+    assert response.status_code == 200, f"创建知识失败: {response.text}"
+    knowledge_id = response.json()["id"]
+
+    response = client.get("/api/v1/knowledge/categories/list")
+    assert category in response.json(), "新增知识后分类列表应立即更新"
+
+    response = client.delete(f"/api/v1/knowledge/{knowledge_id}", headers=auth_headers)
+    assert response.status_code == 200
+    response = client.get("/api/v1/knowledge/categories/list")
+    assert category not in response.json(), "删除知识后分类列表应立即更新"
+
 def test_requirement_details(client, auth_headers, test_requirement_id):
     """测试需求详情"""
     response = client.get(f"/api/v1/requirements/{test_requirement_id}", headers=auth_headers)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+关键词匹配器测试 - 验证多关键词单次扫描的结果
+"""
+
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ai import keyword_matcher
+from backend.ai.keyword_matcher import KeywordMatcher, get_keyword_matcher
+
+
+@pytest.fixture
+def keywords():
+    """示例关键词"""
+    return ["点击", "设置", "调整", "输入", "选择", "确认"]
+
+
+@pytest.fixture
+def sample_steps():
+    """示例测试步骤"""
+    return "1. 选择记忆位置1\n2. 调整座椅位置\n3. 点击存储按钮\n4. 再次点击确认"
+
+
+def test_find_matches_substring_scan(keywords, sample_steps):
+    """测试匹配结果与逐个子串检查一致，并保持关键词顺序"""
+    matcher = KeywordMatcher(keywords)
+    expected = [keyword for keyword in keywords if keyword in sample_steps]
+
+    assert matcher.find(sample_steps) == expected, "匹配结果应该与子串检查一致"
+    assert matcher.count(sample_steps) == len(expected), "重复出现的关键词只计一次"
+    assert matcher.contains_any(sample_steps), "应该检测到关键词"
+
+
+def test_empty_text(keywords):
+    """测试空文本不产生匹配"""
+    matcher = KeywordMatcher(keywords)
+
+    assert matcher.find("") == []
+    assert matcher.count("") == 0
+    assert not matcher.contains_any("")
+    assert not matcher.contains_any("没有任何相关词语")
+
+
+def test_fallback_without_automaton(monkeypatch, keywords, sample_steps):
+    """测试未安装pyahocorasick时回退到子串扫描"""
+    monkeypatch.setattr(keyword_matcher, "ahocorasick", None)
+    matcher = KeywordMatcher(keywords)
+
+    assert matcher.find(sample_steps) == ["点击", "调整", "选择", "确认"]
+    assert matcher.contains_any(sample_steps)
+
+
+def test_count_with_limit(monkeypatch, keywords, sample_steps):
+    """测试计数达到上限后提前停止"""
+    matcher = KeywordMatcher(keywords)
+
+    assert matcher.count(sample_steps, limit=2) == 2, "达到上限后应停止计数"
+    assert matcher.count(sample_steps, limit=10) == matcher.count(sample_steps)
+    assert matcher.count("", limit=2) == 0
+
+    monkeypatch.setattr(keyword_matcher, "ahocorasick", None)
+    assert KeywordMatcher(keywords).count(sample_steps, limit=3) == 3
+
+
+def test_matchers_are_shared(keywords):
+    """测试相同关键词列表共享同一个匹配器"""
+    assert get_keyword_matcher(tuple(keywords)) is get_keyword_matcher(tuple(keywords))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+LLM响应缓存测试 - 验证缓存键、LRU淘汰和过期
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ai import llm_cache
+from backend.ai.llm_cache import LLMCache, make_cache_key
+
+
+def test_cache_key_is_stable():
+    """测试相同请求生成相同的缓存键"""
+    key = make_cache_key("gpt-3.5-turbo", "系统提示词", "用户提示词", 0)
+
+    assert key == make_cache_key("gpt-3.5-turbo", "系统提示词", "用户提示词", 0)
+    assert key != make_cache_key("gpt-3.5-turbo", "系统提示词", "其他提示词", 0), "提示词不同键应不同"
+    assert key != make_cache_key("gpt-3.5-turbo", "系统提示词", "用户提示词", 0.7), "温度不同键应不同"
+
+
+def test_get_and_set():
+    """测试缓存读写"""
+    cache = LLMCache(maxsize=4, ttl=60)
+
+    assert cache.get("missing") is None
+    cache.set("key", "测试用例JSON")
+    assert cache.get("key") == "测试用例JSON"
+
+    cache.clear()
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    """测试超过容量时淘汰最久未使用的条目"""
+    cache = LLMCache(maxsize=2, ttl=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("a") == "1", "最近使用的条目应保留"
+    assert cache.get("b") is None, "最久未使用的条目应被淘汰"
+    assert cache.get("c") == "3"
+
+
+def test_expired_entry_is_dropped(monkeypatch):
+    """测试过期条目不再返回"""
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+
+    cache = LLMCache(maxsize=4, ttl=10)
+    cache.set("key", "value")
+    now[0] += 11
+
+    assert cache.get("key") is None, "过期条目不应返回"
+
+
+def _fake_stream(*deltas):
+    """构造模拟的流式响应分块"""
+    return [
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+        for delta in deltas
+    ]
+
+
+def test_incomplete_completion_is_not_cached(monkeypatch):
+    """测试被截断的LLM响应不会写入缓存"""
+    from backend.ai import test_case_generator
+    from backend.ai.test_case_generator import TestCaseGenerator
+
+    cache = LLMCache(maxsize=4, ttl=60)
+    monkeypatch.setattr(test_case_generator, "_llm_cache", cache)
+    monkeypatch.setattr(test_case_generator, "LLM_CACHE_ENABLED", True)
+
+    responses = [
+        _fake_stream('{"cases": [{"title": "截断'),
+        _fake_stream('{"cases": [', '{"title": "完整"}]}'),
+    ]
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        return responses[len(calls) - 1]
+
+    generator = TestCaseGenerator()
+    generator._client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+
+    assert generator._call_openai_api("用户提示词") == '{"cases": [{"title": "截断'
+    assert generator._call_openai_api("用户提示词") == '{"cases": [{"title": "完整"}]}'
+    assert len(calls) == 2, "截断的响应不应命中缓存"
+
+    assert generator._call_openai_api("用户提示词") == '{"cases": [{"title": "完整"}]}'
+    assert len(calls) == 2, "完整的响应应被缓存"
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+请求限流器测试 - 验证每分钟请求数限制
+"""
+
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ai import rate_limiter
+from backend.ai.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """用可控时钟替代真实时间，sleep 直接推进时钟"""
+    clock = {"now": 0.0, "slept": 0.0}
+
+    def sleep(seconds):
+        clock["now"] += seconds
+        clock["slept"] += seconds
+
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(rate_limiter.time, "sleep", sleep)
+    return clock
+
+
+def test_unlimited_never_waits(fake_clock):
+    """测试不限流时不等待"""
+    limiter = RateLimiter(0)
+    for _ in range(100):
+        limiter.acquire()
+
+    assert fake_clock["slept"] == 0
+
+
+def test_burst_then_throttle(fake_clock):
+    """测试令牌用完后按速率等待"""
+    limiter = RateLimiter(60)
+    for _ in range(60):
+        limiter.acquire()
+    assert fake_clock["slept"] == 0, "初始令牌内的请求不应等待"
+
+    limiter.acquire()
+    assert fake_clock["slept"] == pytest.approx(1.0), "每分钟60次时应等待约1秒"
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+分词模块测试 - 验证延迟初始化在并发首次调用时的正确性
+"""
+
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ai import segmentation
+
+
+def test_concurrent_first_use_adds_every_pending_word():
+    """测试多个线程同时首次分词时不会出错，且关键词都被加入词典"""
+    words = [f"并发座椅关键词{index}" for index in range(200)]
+    segmentation.register_words(words)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(segmentation.cut, [words[0] + "测试"] * 32))
+
+    assert all(words[0] in tokens for tokens in results), "关键词应作为单个词切分"
+    assert not segmentation._pending_words, "待加入的关键词应全部处理完"
+    assert set(words) <= segmentation._registered_words
@@ -97,6 +97,22 @@ def test_requirement_parser_parameter_extraction(sample_content):
     except ImportError:
         pytest.skip("需求解析器或jieba模块不可用")
 
+def test_requirement_parser_range_extraction():
+    """测试范围参数与带单位数值在一次扫描中同时提取"""
+    try:
+        from backend.ai.requirement_parser import RequirementParser
+        
+        parser = RequirementParser()
+        parameters = parser._extract_parameters("调节范围0-250毫米，角度90~120°，1-2-3", [])
+        
+        assert parameters["value_毫"] == 250.0, "范围上限应作为带单位数值提取"
+        assert parameters["value_°"] == 120.0
+        assert parameters["min_value"] == 1.0, "范围上限不能开始新的范围"
+        assert parameters["max_value"] == 2.0
+        
+    except ImportError:
+        pytest.skip("需求解析器或jieba模块不可用")
+
 def test_test_case_generator_import():
     """测试测试用例生成器导入"""
     try:
@@ -163,6 +179,31 @@ def test_test_case_generator_test_types(mock_feature):
     except ImportError:
         pytest.skip("测试用例生成器模块不可用")
 
+def test_test_case_generator_client_retries_after_failure(monkeypatch):
+    """测试OpenAI客户端初始化失败后不会被永久缓存"""
+    from backend.ai import test_case_generator
+    from backend.ai.test_case_generator import TestCaseGenerator
+    
+    attempts = []
+    
+    def flaky_openai(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) == 1:
+            raise RuntimeError("temporary failure")
+        return object()
+    
+    monkeypatch.setattr(test_case_generator, "OpenAI", flaky_openai)
+    monkeypatch.setattr(test_case_generator.settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(test_case_generator.settings, "use_proxy", True)
+    
+    generator = TestCaseGenerator()
+    assert generator.client is None, "首次初始化失败应返回None"
+    
+    client = generator.client
+    assert client is not None, "错误恢复后应重新创建客户端"
+    assert generator.client is client, "成功创建的客户端应被复用"
+    assert len(attempts) == 2
+
 def test_quality_evaluator_import():
     """测试质量评估器导入"""
     try:
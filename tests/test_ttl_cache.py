@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+TTL缓存测试 - 验证读写、过期和容量淘汰
+"""
+
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import ttl_cache
+from backend.ttl_cache import TTLCache
+
+
+def test_get_set_and_pop():
+    """测试缓存读写与删除"""
+    cache = TTLCache(ttl=60, maxsize=4)
+
+    assert cache.get("missing") is None
+    cache.set(("user", 1), {"count": 3})
+    assert cache.get(("user", 1)) == {"count": 3}
+
+    cache.pop(("user", 1))
+    assert cache.get(("user", 1)) is None
+    cache.pop(("user", 1))
+
+    cache.set("a", [1])
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_expired_entry_is_dropped(monkeypatch):
+    """测试过期条目不再返回"""
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+
+    cache = TTLCache(ttl=10, maxsize=4)
+    cache.set("key", "value")
+    now[0] += 11
+
+    assert cache.get("key") is None, "过期条目不应返回"
+
+
+def test_full_cache_prunes_expired_entries_first(monkeypatch):
+    """测试容量已满时先淘汰过期条目，仍满时才清空"""
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+
+    cache = TTLCache(ttl=10, maxsize=2)
+    cache.set("old", 1)
+    now[0] += 5
+    cache.set("fresh", 2)
+    now[0] += 6
+    cache.set("new", 3)
+
+    assert cache.get("fresh") == 2, "未过期条目应保留"
+    assert cache.get("new") == 3
+    assert len(cache) == 2, "过期条目应被淘汰"
+
+    cache.set("newest", 4)
+    assert len(cache) == 1, "没有过期条目时应清空后写入"
+    assert cache.get("newest") == 4
@@ -178,6 +178,79 @@ def test_test_case_generation(db_session, ai_components, test_requirement):
     # 验证测试类型多样性
     assert len(test_types) >= 1, "应该至少生成1种类型的测试用例"
 
+def test_test_case_generation_with_preloaded_features(db_session, ai_components, test_requirement):
+    """测试传入预加载特征时生成结果与查询特征时一致"""
+    from sqlalchemy.orm import joinedload
+    
+    parser = ai_components["parser"]
+    generator = ai_components["generator"]
+    
+    parser.parse_requirement(test_requirement, db_session)
+    expected = generator.generate_test_cases(test_requirement, db_session)
+    
+    requirement = db_session.query(Requirement).options(
+        joinedload(Requirement.parsed_features)
+    ).filter(Requirement.id == test_requirement.id).one()
+    test_cases = generator.generate_test_cases(
+        requirement, db_session, features=requirement.parsed_features
+    )
+    
+    assert [tc.title for tc in test_cases] == [tc.title for tc in expected], "预加载特征应生成相同的测试用例"
+
+def test_test_case_generation_jobs_use_feature_snapshots(db_session, ai_components, test_requirement, monkeypatch):
+    """测试生成任务只携带特征快照，不把ORM对象交给工作线程"""
+    from backend.ai.test_case_generator import FeatureSnapshot
+    
+    parser = ai_components["parser"]
+    generator = ai_components["generator"]
+    parser.parse_requirement(test_requirement, db_session)
+    
+    received = []
+    original_job = generator._generate_feature_job
+    
+    def record_job(feature, test_types):
+        received.append(feature)
+        return original_job(feature, test_types)
+    
+    monkeypatch.setattr(generator, "_generate_feature_job", record_job)
+    test_cases = generator.generate_test_cases(test_requirement, db_session)
+    
+    assert len(received) > 0, "应该至少提交一个生成任务"
+    assert all(isinstance(feature, FeatureSnapshot) for feature in received), "任务应只携带特征快照"
+    assert len(test_cases) > 0, "使用快照仍应生成测试用例"
+
+def test_batch_generation_pairs_each_case_once(ai_components, monkeypatch):
+    """测试批量生成时每个返回的用例只分配给一种测试类型"""
+    from backend.ai.test_case_generator import FeatureSnapshot, LLM_MAX_TOKENS_PER_CASE
+    
+    generator = ai_components["generator"]
+    feature = FeatureSnapshot(
+        id=1,
+        feature_name="座椅加热",
+        feature_type="安全功能",
+        description="座椅加热安全保护",
+        parameters={},
+        priority="high",
+    )
+    calls = []
+    
+    def fake_call(user_prompt, max_tokens):
+        calls.append(max_tokens)
+        return (
+            '{"cases": [{"title": "SEC", "test_type": "security"}, '
+            '{"title": "FUNC", "test_type": "security"}]}'
+        )
+    
+    monkeypatch.setattr(generator, "_call_openai_api", fake_call)
+    test_cases = generator._generate_test_cases_batch(feature, ["function", "security"])
+    
+    assert [(case.title, case.test_type) for case in test_cases] == [
+        ("FUNC", "function"),
+        ("SEC", "security"),
+    ], "同一用例不应被重复使用，且测试类型应为请求的类型"
+    assert calls == [2 * LLM_MAX_TOKENS_PER_CASE], "max_tokens应随测试类型数量增加"
+
+
 def test_quality_evaluation(db_session, ai_components, test_requirement):
     """测试质量评估功能"""
     parser = ai_components["parser"]
@@ -212,6 +285,37 @@ def test_quality_evaluation(db_session, ai_components, test_requirement):
         assert hasattr(evaluation, 'total_score'), "评估结果应该有总分"
         assert 0 <= evaluation.total_score <= 100, "总分应该在0-100之间"
 
+def test_batch_quality_evaluation(db_session, ai_components, test_requirement):
+    """测试批量质量评估功能"""
+    parser = ai_components["parser"]
+    generator = ai_components["generator"]
+    evaluator = ai_components["evaluator"]
+    
+    parser.parse_requirement(test_requirement, db_session)
+    generator.generate_test_cases(test_requirement, db_session)
+    
+    test_case_ids = [
+        test_case.id for test_case in db_session.query(TestCase).filter(
+            TestCase.requirement_id == test_requirement.id
+        ).all()
+    ]
+    assert len(test_case_ids) > 0, "需要先生成测试用例"
+    
+    # 批量评估两次，评估记录应该被替换而不是累加
+    evaluator.batch_evaluate(test_case_ids, db_session)
+    results = evaluator.batch_evaluate(test_case_ids + [-1], db_session)
+    
+    assert list(results) == test_case_ids, "应该按输入顺序返回已存在测试用例的评估结果"
+    for result in results.values():
+        assert 0 <= result.total_score <= 100, "总分应该在0-100之间"
+    
+    evaluations = db_session.query(TestCaseEvaluation).filter(
+        TestCaseEvaluation.test_case_id.in_(test_case_ids)
+    ).all()
+    assert len(evaluations) == len(test_case_ids), "每个测试用例应该只有一条评估记录"
+    for evaluation in evaluations:
+        assert evaluation.total_score == results[evaluation.test_case_id].total_score, "保存的评分应该与返回结果一致"
+
 def test_full_workflow(db_session, ai_components, test_user, test_requirement):
     """测试完整工作流程"""
     parser = ai_components["parser"]